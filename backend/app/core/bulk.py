@@ -0,0 +1,330 @@
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import os
+
+import logging
+logger = logging.getLogger("bulk")
+
+from app.core.stats import record_created, record_deleted, record_toggled
+from app.core.versioning import bump_version
+from app.models import models
+
+# Rows per multi-row INSERT / ids per IN (...) list. Keeps statements well under the
+# driver/server parameter limits (SQLite: 32766, MariaDB: 65535).
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", "500"))
+
+RETURNED_COLUMNS = (
+    models.Item.id,
+    models.Item.title,
+    models.Item.description,
+    models.Item.is_active,
+    models.Item.created_at,
+    models.Item.updated_at,
+    models.Item.version,
+)
+
+def chunked(values: List[Any], size: int) -> Iterable[List[Any]]:
+    """Yield successive slices of at most `size` elements."""
+    size = max(1, size)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def stamp_changes(db: Session, item_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+    """Bump the items version and store it as the change_seq of the items written.
+
+    Call after the transaction's other writes, right before it commits:
+    pending ORM changes are flushed first, so the version row is the last
+    lock taken. It stays locked until commit, which keeps writers holding
+    it for only that short window; a writer holding it waits for no other
+    lock, so writers cannot deadlock on it. Transactions thus commit in
+    change_seq order. Returns the new version."""
+    db.flush()
+    change_seq = bump_version(db)
+    for chunk in chunked(list(dict.fromkeys(item_ids)), chunk_size):
+        db.execute(
+            # Setting updated_at to itself keeps its onupdate from firing:
+            # stamping is bookkeeping, not a change to the item
+            update(models.Item)
+            .where(models.Item.id.in_(chunk))
+            .values(change_seq=change_seq, updated_at=models.Item.updated_at),
+            execution_options={"synchronize_session": False},
+        )
+    return change_seq
+
+def validate_item_row(row: Dict[str, Any]) -> None:
+    """Check a row against the column constraints of the items table.
+
+    Catches the errors the database would raise (NOT NULL, VARCHAR length)
+    before the INSERT, so a bad row does not abort the whole chunk."""
+    for column in models.Item.__table__.columns:
+        if column.name not in row:
+            continue
+        value = row[column.name]
+        if value is None:
+            if not column.nullable:
+                raise ValueError(f"{column.name} must not be null")
+            continue
+        length = getattr(column.type, "length", None)
+        if length is not None and isinstance(value, str) and len(value) > length:
+            raise ValueError(f"{column.name} exceeds maximum length of {length} characters")
+
+def _insert_returning(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert rows with a single multi-row INSERT ... RETURNING."""
+    stmt = insert(models.Item).values(rows).returning(*RETURNED_COLUMNS)
+    created = [dict(r._mapping) for r in db.execute(stmt)]
+    # RETURNING order is not guaranteed; ids of one statement are ascending.
+    created.sort(key=lambda r: r["id"])
+    return created
+
+def _insert_lastrowid(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert rows one INSERT at a time, keeping each lastrowid, and read them back by id.
+
+    Used when the dialect cannot return rows from an INSERT (MySQL, MariaDB
+    before 10.5). The ids of a multi-row INSERT need not be consecutive
+    (innodb_autoinc_lock_mode=2, auto_increment_increment > 1), so they
+    cannot be derived from the first one. The INSERTs share a savepoint, so
+    the chunk still succeeds or fails as a whole."""
+    with db.begin_nested():
+        ids = [db.execute(insert(models.Item).values(row)).lastrowid for row in rows]
+    created = db.execute(
+        select(*RETURNED_COLUMNS)
+        .where(models.Item.id.in_(ids))
+        .order_by(models.Item.id)
+    )
+    return [dict(r._mapping) for r in created]
+
+def _insert_chunk(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert one chunk so that it succeeds or fails as a whole."""
+    if db.get_bind().dialect.insert_returning:
+        return _insert_returning(db, rows)
+    return _insert_lastrowid(db, rows)
+
+def bulk_insert_items(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Insert item rows in chunks of multi-row INSERT statements.
+
+    Returns (created, failed). Rows are validated up front; a chunk that
+    still fails in the database is retried row by row, each row inside its
+    own savepoint, so only the offending rows end up in `failed`. The item
+    stats are updated and the created rows stamped (see stamp_changes) in
+    the same transaction; the caller is responsible for committing."""
+    created = []
+    failed = []
+    pending = []
+
+    for idx, row in enumerate(rows):
+        try:
+            validate_item_row(row)
+            pending.append((idx, row))
+        except ValueError as e:
+            failed.append({"index": idx, "item": row, "error": str(e)})
+
+    for chunk in chunked(pending, chunk_size):
+        try:
+            created.extend(_insert_chunk(db, [row for _, row in chunk]))
+            continue
+        except DBAPIError as e:
+            # The failed statement is rolled back as a whole; retry each row
+            # on its own to isolate the ones the database rejects.
+            logger.warning(f"Bulk insert of {len(chunk)} rows failed, retrying row by row: {e}")
+
+        for idx, row in chunk:
+            savepoint = db.begin_nested()
+            try:
+                created.extend(_insert_chunk(db, [row]))
+                savepoint.commit()
+            except DBAPIError as e:
+                savepoint.rollback()
+                failed.append({"index": idx, "item": rows[idx], "error": str(e.orig)})
+
+    active = sum(1 for row in created if row["is_active"])
+    record_created(db, active, len(created) - active)
+    if created:
+        stamp_changes(db, [row["id"] for row in created], chunk_size)
+    failed.sort(key=lambda f: f["index"])
+    return created, failed
+
+def bulk_get_items(
+    db: Session,
+    item_ids: List[int],
+    fields: Optional[List[str]] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Look up items by id with one SELECT per chunk of ids.
+
+    Returns (items, missing): the items in the order their ids were given,
+    with repeated ids returned once, and the ids that do not exist (or were
+    deleted). With `fields`, only those columns are selected and returned."""
+    columns = RETURNED_COLUMNS
+    if fields:
+        columns = tuple(column for column in RETURNED_COLUMNS if column.key in fields)
+    # The id is needed to put rows back in request order
+    query_columns = columns if models.Item.id in columns else (models.Item.id, *columns)
+
+    unique_ids = list(dict.fromkeys(item_ids))
+    found = {}
+    for chunk in chunked(unique_ids, chunk_size):
+        for r in db.execute(select(*query_columns).where(models.Item.id.in_(chunk), models.Item.deleted_at.is_(None))):
+            found[r.id] = {column.key: r._mapping[column.key] for column in columns}
+
+    items = [found[item_id] for item_id in unique_ids if item_id in found]
+    missing = [item_id for item_id in unique_ids if item_id not in found]
+    return items, missing
+
+def bulk_delete_items(
+    db: Session,
+    item_ids: List[int],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Delete items by id with one SELECT and one UPDATE per chunk of ids.
+
+    Items are soft-deleted: deleted_at is set and the row is kept as a
+    tombstone for the changes feed. Returns (deleted, failed). Deleted rows
+    are returned as they were before the delete; ids that do not exist (or
+    repeat an id already deleted) are reported in `failed`. The item stats
+    are updated and the deleted rows stamped (see stamp_changes) in the same
+    transaction; the caller is responsible for committing."""
+    found = {}
+    for chunk in chunked(list(dict.fromkeys(item_ids)), chunk_size):
+        rows = db.execute(select(*RETURNED_COLUMNS).where(models.Item.id.in_(chunk), models.Item.deleted_at.is_(None)))
+        found_ids = []
+        for r in rows:
+            found[r.id] = dict(r._mapping)
+            found_ids.append(r.id)
+        if found_ids:
+            db.execute(
+                update(models.Item)
+                .where(models.Item.id.in_(found_ids))
+                .values(deleted_at=func.now()),
+                execution_options={"synchronize_session": False},
+            )
+
+    deleted = []
+    failed = []
+    for idx, item_id in enumerate(item_ids):
+        row = found.pop(item_id, None)
+        if row is None:
+            failed.append({"index": idx, "item_id": item_id, "error": "404: Item not found"})
+        else:
+            deleted.append(row)
+    record_deleted(db, ((row["created_at"], row["is_active"]) for row in deleted))
+    if deleted:
+        stamp_changes(db, [row["id"] for row in deleted], chunk_size)
+    return deleted, failed
+
+def _update_group(db: Session, fields: Tuple[str, ...], updates: List[Dict[str, Any]], versions: Dict[int, int]) -> Optional[Set[int]]:
+    """Apply updates that change the same fields with one UPDATE statement.
+
+    A field that differs between rows is set with CASE id WHEN ... THEN ...;
+    the version check is repeated in the WHERE clause so a row changed
+    since it was read is left alone. Returns the ids of the rows the UPDATE
+    changed, or None when the dialect cannot return them and some rows were
+    left alone."""
+    ids = [u["id"] for u in updates]
+    values = {}
+    for field in fields:
+        distinct = {u[field] for u in updates}
+        if len(distinct) == 1:
+            values[field] = distinct.pop()
+        else:
+            values[field] = case({u["id"]: u[field] for u in updates}, value=models.Item.id)
+    values["version"] = models.Item.version + 1
+    expected = versions[ids[0]] if len(ids) == 1 else case({i: versions[i] for i in ids}, value=models.Item.id)
+    stmt = update(models.Item).where(models.Item.id.in_(ids), models.Item.version == expected).values(values)
+    if db.get_bind().dialect.update_returning:
+        result = db.execute(stmt.returning(models.Item.id), execution_options={"synchronize_session": False})
+        return set(result.scalars())
+    result = db.execute(stmt, execution_options={"synchronize_session": False})
+    return set(ids) if result.rowcount == len(ids) else None
+
+def bulk_update_items(
+    db: Session,
+    updates: List[Dict[str, Any]],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Apply partial updates, each a dict with "id", an optional "version" and the fields to set.
+
+    Returns (updated, failed). The current rows are read (and locked where
+    the database supports SELECT ... FOR UPDATE) with one SELECT per chunk
+    of ids; updates are then grouped by the set of fields they change and
+    applied with one UPDATE per group and chunk. An update whose "version"
+    does not match the stored one is reported as a 409 conflict. The item
+    stats are updated and the changed rows stamped (see stamp_changes) in
+    the same transaction; the caller is responsible for committing."""
+    current = {}
+    for chunk in chunked(list(dict.fromkeys(u["id"] for u in updates)), chunk_size):
+        rows = db.execute(
+            select(*RETURNED_COLUMNS).where(models.Item.id.in_(chunk), models.Item.deleted_at.is_(None)).with_for_update()
+        )
+        current.update((r.id, dict(r._mapping)) for r in rows)
+
+    failed = []
+    accepted = {}
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for idx, u in enumerate(updates):
+        item_id = u["id"]
+        fields = {key: value for key, value in u.items() if key not in ("id", "version")}
+        row = current.get(item_id)
+        try:
+            if item_id in accepted:
+                raise ValueError(f"Item {item_id} appears more than once in the batch")
+            if row is None:
+                raise ValueError("404: Item not found")
+            if u.get("version") is not None and u["version"] != row["version"]:
+                raise ValueError(f"409: Version conflict (expected {u['version']}, current {row['version']})")
+            validate_item_row(fields)
+        except ValueError as e:
+            failed.append({"index": idx, "item_id": item_id, "error": str(e)})
+            continue
+        accepted[item_id] = (idx, row)
+        if fields:
+            groups.setdefault(tuple(sorted(fields)), []).append({"id": item_id, **fields})
+
+    versions = {item_id: row["version"] for item_id, (_, row) in accepted.items()}
+    # Rows are counted as updated from what the UPDATE reports: on SQLite the
+    # SELECT above locks nothing, so another writer may have changed a row
+    # (and its version) in between, and then the UPDATE leaves it alone.
+    # Without RETURNING (MySQL) the rows are locked by SELECT ... FOR UPDATE,
+    # so reading the version back tells which rows of a short chunk changed.
+    applied: Set[int] = set()
+    unsure: Set[int] = set()
+    for fields, group in groups.items():
+        for chunk in chunked(group, chunk_size):
+            ids = _update_group(db, fields, chunk, versions)
+            if ids is None:
+                unsure.update(u["id"] for u in chunk)
+            else:
+                applied |= ids
+
+    # Read the rows back for the response: server-side defaults such as
+    # updated_at are only known after the UPDATE
+    changed = {item_id for group in groups.values() for item_id in (u["id"] for u in group)}
+    fresh = {}
+    for chunk in chunked(list(applied | unsure), chunk_size):
+        fresh.update((r.id, dict(r._mapping)) for r in db.execute(select(*RETURNED_COLUMNS).where(models.Item.id.in_(chunk))))
+
+    updated = []
+    written = []
+    for item_id, (idx, row) in accepted.items():
+        if item_id not in changed:
+            updated.append(row)
+        elif item_id in applied or (item_id in unsure and fresh.get(item_id, {}).get("version") == row["version"] + 1):
+            updated.append(fresh[item_id])
+            written.append(item_id)
+        else:
+            failed.append({"index": idx, "item_id": item_id, "error": "409: Version conflict (item changed during the update)"})
+
+    record_toggled(db, (
+        (row["created_at"], row["is_active"])
+        for row in updated
+        if bool(row["is_active"]) != bool(accepted[row["id"]][1]["is_active"])
+    ))
+    if written:
+        stamp_changes(db, written, chunk_size)
+    failed.sort(key=lambda f: f["index"])
+    return updated, failed
@@ -0,0 +1,231 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from starlette.concurrency import run_in_threadpool
+from typing import Iterable, Optional
+import os
+import threading
+import time
+
+import logging
+logger = logging.getLogger("cache")
+
+from app.core.metrics import Counter, Gauge
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# How long an invalidated key refuses add(); longer than a read-through miss
+# takes to read the database and store its result
+CACHE_INVALIDATION_TTL_SECONDS = float(os.environ.get("CACHE_INVALIDATION_TTL_SECONDS", "5"))
+
+CACHE_HITS = Counter("cache_hits_total", "Cache lookups that returned a value", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache lookups that found nothing", ["cache"])
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Entries dropped before being invalidated", ["cache", "reason"])
+CACHE_INVALIDATIONS = Counter("cache_invalidations_total", "Entries removed because the data changed", ["cache"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries held by the in-process cache", ["cache"])
+
+class Cache(ABC):
+    """Byte-string cache keyed by string.
+
+    delete() leaves a short-lived marker in place of each key, and add()
+    stores a value only when the key holds neither a value nor a marker.
+    A read-through miss stores its result with add(), so a value read from
+    the database before a concurrent write cannot be stored after that
+    write's invalidation. The async helpers let async handlers use a cache
+    without blocking the event loop when the backend does network I/O."""
+    # True when operations do network I/O and must not run on the event loop
+    remote = False
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def add(self, key: str, value: bytes) -> None:
+        """Store `value` unless the key holds a value or was invalidated recently."""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        ...
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        return await run_in_threadpool(self.get, key) if self.remote else self.get(key)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        return await run_in_threadpool(self.set, key, value) if self.remote else self.set(key, value)
+
+    async def aadd(self, key: str, value: bytes) -> None:
+        return await run_in_threadpool(self.add, key, value) if self.remote else self.add(key, value)
+
+    async def adelete(self, keys: Iterable[str]) -> None:
+        return await run_in_threadpool(self.delete, list(keys)) if self.remote else self.delete(keys)
+
+class NullCache(Cache):
+    """Disables caching: every lookup is a miss."""
+
+    def get(self, key):
+        CACHE_MISSES.inc(cache=self.name)
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def add(self, key, value):
+        pass
+
+    def delete(self, keys):
+        pass
+
+class LRUCache(Cache):
+    """In-process least-recently-used cache with a per-entry time to live.
+
+    An invalidated key is kept as an entry with no value."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        invalidation_ttl: float = CACHE_INVALIDATION_TTL_SECONDS,
+    ):
+        super().__init__(name)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.invalidation_ttl = invalidation_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        CACHE_ENTRIES.set_function(lambda: len(self._entries), cache=name)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                if entry[1] is not None:
+                    CACHE_EVICTIONS.inc(cache=self.name, reason="expired")
+                entry = None
+            if entry is None or entry[1] is None:
+                CACHE_MISSES.inc(cache=self.name)
+                return None
+            self._entries.move_to_end(key)
+        CACHE_HITS.inc(cache=self.name)
+        return entry[1]
+
+    def _store(self, key, value, ttl):
+        # Caller holds the lock
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.inc(cache=self.name, reason="size")
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value, self.ttl)
+
+    def add(self, key, value):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._store(key, value, self.ttl)
+
+    def delete(self, keys):
+        removed = 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None:
+                    removed += 1
+                self._store(key, None, self.invalidation_ttl)
+        if removed:
+            CACHE_INVALIDATIONS.inc(removed, cache=self.name)
+
+class RedisCache(Cache):
+    """Cache shared by every worker process, stored in Redis (or Valkey/KeyDB).
+
+    Requires the optional `redis` package. Evictions happen inside the
+    server and are not counted here. An invalidated key holds an empty
+    string, which no stored value is."""
+    remote = True
+
+    def __init__(
+        self,
+        name: str,
+        url: str = CACHE_REDIS_URL,
+        ttl: float = CACHE_TTL_SECONDS,
+        invalidation_ttl: float = CACHE_INVALIDATION_TTL_SECONDS,
+    ):
+        super().__init__(name)
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.errors = redis.RedisError
+        self.ttl = ttl
+        self.invalidation_ttl = invalidation_ttl
+        self.prefix = f"{name}:"
+
+    # An unreachable cache degrades to reading from the database; a failed
+    # invalidation leaves the entry stale until its TTL runs out
+
+    def get(self, key):
+        try:
+            value = self.client.get(self.prefix + key)
+        except self.errors as e:
+            logger.warning(f"Cache get failed: {e}")
+            value = None
+        if not value:
+            CACHE_MISSES.inc(cache=self.name)
+            value = None
+        else:
+            CACHE_HITS.inc(cache=self.name)
+        return value
+
+    def set(self, key, value):
+        try:
+            self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+        except self.errors as e:
+            logger.warning(f"Cache set failed: {e}")
+
+    def add(self, key, value):
+        try:
+            self.client.set(self.prefix + key, value, px=int(self.ttl * 1000), nx=True)
+        except self.errors as e:
+            logger.warning(f"Cache set failed: {e}")
+
+    def delete(self, keys):
+        keys = [self.prefix + key for key in keys]
+        if not keys:
+            return
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.set(key, b"", px=int(self.invalidation_ttl * 1000), get=True)
+            CACHE_INVALIDATIONS.inc(sum(1 for old in pipeline.execute() if old), cache=self.name)
+        except self.errors as e:
+            logger.error(f"Cache invalidation failed, entries stay stale for up to {self.ttl}s: {e}")
+
+def create_cache(name: str) -> Cache:
+    """Build the cache selected by CACHE_BACKEND (memory, redis or none)."""
+    if CACHE_BACKEND == "none":
+        return NullCache(name)
+    if CACHE_BACKEND == "redis":
+        logger.info(f"Using Redis cache at {CACHE_REDIS_URL} for {name}")
+        return RedisCache(name)
+    return LRUCache(name)
+
+# Serialized ItemResponse JSON by item id
+item_cache = create_cache("item")
+
+def item_key(item_id: int) -> str:
+    return str(item_id)
+
+def invalidate_items(item_ids: Iterable[int]) -> None:
+    item_cache.delete([item_key(item_id) for item_id in item_ids])
@@ -0,0 +1,48 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.bulk import RETURNED_COLUMNS
+from app.models import models
+
+CHANGES_MAX_LIMIT = 1000
+
+CHANGE_COLUMNS = RETURNED_COLUMNS + (models.Item.deleted_at, models.Item.change_seq)
+
+# Every write transaction stamps the rows it writes with the items version it
+# bumps to right before committing (see app.core.bulk.stamp_changes), and the
+# version row lock makes transactions commit in version order: change_seq
+# orders changes by commit, not by when the transaction started. A client
+# that has applied every change up to a sequence therefore only needs the
+# rows with a higher one, read in (change_seq, id) order from
+# ix_items_change_seq.
+
+def _rows(db: Session, stmt) -> List[Dict[str, Any]]:
+    return [dict(r._mapping) for r in db.execute(stmt)]
+
+def changes_since(db: Session, since: Optional[int], limit: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Items written after change sequence `since` (all items, deleted ones included, when None).
+
+    Returns (changes, next_since, has_more). Changes are item rows with their
+    change_seq and deleted_at, oldest change first. A page ends on a
+    transaction boundary, so it may hold more than `limit` rows when the
+    last transaction wrote many items; pass next_since back as since to
+    get the following page."""
+    seq = models.Item.change_seq
+    after = -1 if since is None else since
+    changes = _rows(db, select(*CHANGE_COLUMNS).where(seq > after).order_by(seq, models.Item.id).limit(limit + 1))
+    has_more = len(changes) > limit
+    if has_more:
+        first_left_out = changes.pop()
+        last = changes[-1]
+        if first_left_out["change_seq"] == last["change_seq"]:
+            # Finish the last transaction, so clients never apply part of one
+            changes += _rows(
+                db,
+                select(*CHANGE_COLUMNS)
+                .where(seq == last["change_seq"], models.Item.id > last["id"])
+                .order_by(models.Item.id),
+            )
+            has_more = db.execute(select(models.Item.id).where(seq > last["change_seq"]).limit(1)).first() is not None
+    next_since = changes[-1]["change_seq"] if changes else max(after, 0)
+    return changes, next_since, has_more
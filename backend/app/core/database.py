@@ -1,6 +1,10 @@
 from typing import Dict, Any
 from app.core import database_sqlite, database_mysql
+from app.core.instrumentation import instrument_queries
 import os
+
+import logging
+logger = logging.getLogger("database")
 def init_sqlite() -> Dict[str, Any]:
     """Initialize SQLite database"""    
     return database_sqlite.create_db()
@@ -10,15 +14,42 @@ def init_mysql() -> Dict[str, Any]:
     
     return database_mysql.create_db()
 
+# Serve the hot item endpoints with async handlers over an async engine
+ASYNC_MODE = os.environ.get("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+if ASYNC_MODE and os.environ.get("ENVIRONMENT") != "production" and not database_sqlite.SQLITE_PATH:
+    # The async engine would need its own connection to the in-memory
+    # database, i.e. a shared-cache one, whose table locks ignore
+    # busy_timeout and fail concurrent requests with "database table is locked"
+    logger.warning("DB_ASYNC with SQLite needs SQLITE_PATH; using the sync handlers")
+    ASYNC_MODE = False
+
+async_components = None
 if os.environ.get("ENVIRONMENT") == "production":
     # Initialize MySQL database
     db_components = init_mysql()
+    if ASYNC_MODE:
+        async_components = database_mysql.create_async_db()
+elif ASYNC_MODE:
+    # Both engines open the SQLITE_PATH file
+    db_components = init_sqlite()
+    async_components = database_sqlite.create_async_db()
 else:
     # Initialize SQLite database        
     db_components = init_sqlite()
     
+# Query counts and timings at /metrics, slow statements to the slow_query log
+engine_name = "mysql" if os.environ.get("ENVIRONMENT") == "production" else "sqlite"
+instrument_queries(db_components['engine'], engine_name)
+if async_components:
+    instrument_queries(async_components['engine'].sync_engine, f"{engine_name}_async")
+    
 # Export components
 engine = db_components['engine']
 SessionLocal = db_components['SessionLocal']
 Base = db_components['Base']
-get_db = db_components['get_db']
\ No newline at end of file
+get_db = db_components['get_db']
+
+# Async components, only available when ASYNC_MODE is enabled
+async_engine = async_components['engine'] if async_components else None
+AsyncSessionLocal = async_components['SessionLocal'] if async_components else None
+get_async_db = async_components['get_db'] if async_components else None
\ No newline at end of file
@@ -1,8 +1,11 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine, pool_options
+
 import logging
 # Configure logging
 logging.basicConfig(
@@ -11,19 +14,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger("database_mysql")
 
+# InnoDB FULLTEXT index over items.title/description for /api/items/search,
+# maintained by the server on every write. Words shorter than
+# innodb_ft_min_token_size (3 by default) are not indexed.
+SEARCH_INDEX = "ix_items_fulltext"
+SEARCH_DDL = (
+    f"CREATE FULLTEXT INDEX IF NOT EXISTS {SEARCH_INDEX} ON items (title, description)",
+)
+
+def database_url(driver="pymysql"):
+    """Build the database URL from environment variables for the given driver."""
+    DB_HOST = os.environ.get("DB_HOST")
+    DB_PORT = os.environ.get("DB_PORT")
+    DB_USER = os.environ.get("DB_USER")
+    DB_PASSWORD = os.environ.get("DB_PASSWORD")
+    DB_NAME = os.environ.get("DB_NAME")
+    return f'mysql+{driver}://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
 def create_db():
     """Initialize database connection and return necessary components."""
     try:
-        # Get database configuration from environment variables
-        DB_HOST = os.environ.get("DB_HOST")
-        DB_PORT = os.environ.get("DB_PORT")
-        DB_USER = os.environ.get("DB_USER")
-        DB_PASSWORD = os.environ.get("DB_PASSWORD")
-        DB_NAME = os.environ.get("DB_NAME")
-        database_url = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
-        logger.info(f"Connecting to MySQL database at {DB_HOST}:{DB_PORT}/{DB_NAME}...")
-        
-        engine = create_engine(database_url)
+        logger.info(f"Connecting to MySQL database at {os.environ.get('DB_HOST')}:{os.environ.get('DB_PORT')}/{os.environ.get('DB_NAME')}...")
+        
+        options = pool_options()
+        logger.info(f"Connection pool settings: {options}")
+        engine = create_engine(database_url(), poolclass=InstrumentedQueuePool, **options)
+        instrument_engine(engine, "mysql")
         logger.info("MySQL database connection established successfully!")
         
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -44,4 +60,28 @@ def create_db():
         }
     except Exception as e:
         logger.error(f"Failed to connect to MySQL database: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def create_async_db():
+    """Initialize an async database connection and return its components."""
+    try:
+        logger.info(f"Connecting async to MySQL database at {os.environ.get('DB_HOST')}:{os.environ.get('DB_PORT')}/{os.environ.get('DB_NAME')}...")
+        
+        engine = create_async_engine(database_url("aiomysql"), poolclass=InstrumentedAsyncQueuePool, **pool_options())
+        instrument_engine(engine.sync_engine, "mysql_async")
+        logger.info("Async MySQL database engine created successfully!")
+        
+        SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        
+        async def get_db():
+            async with SessionLocal() as db:
+                yield db
+        
+        return {
+            'engine': engine,
+            'SessionLocal': SessionLocal,
+            'get_db': get_db
+        }
+    except Exception as e:
+        logger.error(f"Failed to create async MySQL engine: {e}")
+        raise
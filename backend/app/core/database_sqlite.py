@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
 import logging
+import os
 
 # Configure logging
 logging.basicConfig(
@@ -10,24 +14,110 @@ logging.basicConfig(
 )
 logger = logging.getLogger("database_sqlite")
 
+# Path of a persistent database file; when unset the database lives in memory
+SQLITE_PATH = os.environ.get("SQLITE_PATH")
+
+# Tuning for the file-backed database, applied to every new connection
+SQLITE_POOL_SIZE = int(os.environ.get("SQLITE_POOL_SIZE", "10"))
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+FILE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    # negative cache_size is in KiB rather than pages
+    f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+)
+
 # SQLite URL for in-memory database
-DATABASE_URL = "sqlite:///:memory:"
+MEMORY_DATABASE_URL = "sqlite:///:memory:"
+
+if SQLITE_PATH:
+    # Every connection to a file sees the same database
+    DATABASE_URL = f"sqlite:///{SQLITE_PATH}"
+    ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{SQLITE_PATH}"
+else:
+    # The in-memory database lives in the sync engine's single connection;
+    # the async engine needs a file (see app.core.database)
+    DATABASE_URL = MEMORY_DATABASE_URL
+    ASYNC_DATABASE_URL = None
+
+# FTS5 index over items.title/description for /api/items/search. It is an
+# external-content table: it stores only the index and reads the text back
+# from items, which the triggers keep it in sync with.
+SEARCH_TABLE = "items_fts"
+SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "title, description, content='items', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF title, description ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
 
-def create_db():
+def schema_ddl(Base, dialect):
+    """CREATE TABLE / CREATE INDEX IF NOT EXISTS statements for every mapped table."""
+    for table in Base.metadata.sorted_tables:
+        yield str(CreateTable(table, if_not_exists=True).compile(dialect=dialect))
+        for index in table.indexes:
+            yield str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+
+def apply_file_pragmas(dbapi_connection, connection_record):
+    """WAL journal and cache settings for a new connection to the database file."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in FILE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def create_db(database_url=DATABASE_URL):
     """Initialize database connection and return necessary components."""
     try:
-        logger.info("Creating in-memory SQLite database...")
-        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-        logger.info("In-memory SQLite database created successfully!")
+        in_memory = SQLITE_PATH is None
+        if in_memory:
+            # Every connection to :memory: is a separate database; keep a
+            # single connection open and let threads take turns on it
+            pool_options = {"poolclass": QueuePool, "pool_size": 1, "max_overflow": 0}
+        else:
+            # WAL lets readers run alongside the writer, so give each thread
+            # its own connection
+            pool_options = {"poolclass": QueuePool, "pool_size": SQLITE_POOL_SIZE, "max_overflow": SQLITE_POOL_SIZE}
+        
+        logger.info("Creating in-memory SQLite database..." if in_memory else f"Opening SQLite database at {SQLITE_PATH}...")
+        engine = create_engine(database_url, connect_args={"check_same_thread": False}, **pool_options)
+        logger.info("SQLite database created successfully!")
         
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         Base = declarative_base()
         
+        if in_memory:
+            @event.listens_for(engine, "connect")
+            def create_schema(dbapi_connection, connection_record):
+                # A new connection to an in-memory database may open an empty
+                # database, so create the tables once per connection rather than
+                # once per request
+                cursor = dbapi_connection.cursor()
+                try:
+                    for statement in schema_ddl(Base, engine.dialect):
+                        cursor.execute(statement)
+                    if "items" in Base.metadata.tables:
+                        for statement in SEARCH_DDL:
+                            cursor.execute(statement)
+                finally:
+                    cursor.close()
+        else:
+            event.listen(engine, "connect", apply_file_pragmas)
+        
         def get_db():
             db = SessionLocal()
             try:
-                # Ensure tables are created for this session
-                Base.metadata.create_all(bind=engine)
                 yield db
             finally:
                 db.close()
@@ -41,3 +131,26 @@ def create_db():
     except Exception as e:
         logger.error(f"Failed to create SQLite database: {e}")
         raise
+
+def create_async_db(database_url=ASYNC_DATABASE_URL):
+    """Initialize an async database connection to the SQLITE_PATH file and return its components."""
+    try:
+        logger.info("Creating async SQLite database engine...")
+        engine = create_async_engine(database_url, pool_size=SQLITE_POOL_SIZE, max_overflow=SQLITE_POOL_SIZE)
+        event.listen(engine.sync_engine, "connect", apply_file_pragmas)
+        logger.info("Async SQLite database engine created successfully!")
+        
+        SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        
+        async def get_db():
+            async with SessionLocal() as db:
+                yield db
+        
+        return {
+            'engine': engine,
+            'SessionLocal': SessionLocal,
+            'get_db': get_db
+        }
+    except Exception as e:
+        logger.error(f"Failed to create async SQLite database: {e}")
+        raise
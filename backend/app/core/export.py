@@ -0,0 +1,96 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Sequence
+from datetime import datetime
+import csv
+import io
+import json
+import os
+
+from app.core.database import SessionLocal
+from app.models import models
+
+# Rows read per query (and per streamed chunk).
+EXPORT_FETCH_SIZE = int(os.environ.get("EXPORT_FETCH_SIZE", "1000"))
+
+# Upper bound on the rows returned inline by the MCP export tool.
+EXPORT_SAMPLE_MAX = 100
+
+EXPORT_COLUMNS = (
+    models.Item.id,
+    models.Item.title,
+    models.Item.description,
+    models.Item.is_active,
+    models.Item.created_at,
+    models.Item.updated_at,
+    models.Item.version,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _iter_row_partitions() -> Iterator[Sequence[Sequence[Any]]]:
+    """Yield lists of row tuples of the items table, EXPORT_FETCH_SIZE rows at a time.
+
+    Each partition is read in its own short session, keyed on the last id
+    sent, so the connection goes back to the pool while the client reads the
+    partition: a slow client never holds one (the in-memory SQLite pool has
+    only one). The response body is produced after the request dependencies
+    (and their session) have been torn down in any case. Items created or
+    deleted during the export show up or not depending on where it is."""
+    last_id = 0
+    while True:
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .where(models.Item.deleted_at.is_(None), models.Item.id > last_id)
+            .order_by(models.Item.id)
+            .limit(EXPORT_FETCH_SIZE)
+        )
+        with SessionLocal() as db:
+            partition = db.execute(stmt).all()
+        if not partition:
+            return
+        yield partition
+        if len(partition) < EXPORT_FETCH_SIZE:
+            return
+        last_id = partition[-1][0]
+
+def iter_ndjson() -> Iterator[bytes]:
+    """Stream the items table as newline-delimited JSON, one chunk per partition."""
+    for partition in _iter_row_partitions():
+        lines = [
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), ensure_ascii=False)
+            for row in partition
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+def iter_csv() -> Iterator[bytes]:
+    """Stream the items table as CSV with a header row, one chunk per partition."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for partition in _iter_row_partitions():
+        writer.writerows([_plain(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+EXPORT_WRITERS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+def export_sample(db: Session, limit: int) -> List[Dict[str, Any]]:
+    """Return the first `limit` rows in export order, as plain dicts."""
+    stmt = select(*EXPORT_COLUMNS).where(models.Item.deleted_at.is_(None)).order_by(models.Item.id).limit(limit)
+    return [dict(zip(EXPORT_FIELDS, map(_plain, row))) for row in db.execute(stmt)]
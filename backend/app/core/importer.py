@@ -0,0 +1,200 @@
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import csv
+import json
+import os
+import time
+import uuid
+
+from app.core.bulk import bulk_insert_items
+from app.core.database import SessionLocal
+from app.models import models
+from app.schemas.item import ItemCreate
+
+# Rows validated and committed per transaction while importing.
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", "1000"))
+
+# Failed lines reported individually in the summary; the rest are only counted.
+IMPORT_MAX_REPORTED_FAILURES = 1000
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into (line number, line) pairs, 1-based.
+
+    Lines are left undecoded, so that the record iterators can report a
+    line that is not valid UTF-8 as failed instead of aborting the import."""
+    pending = b""
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip(b"\r")
+    if pending:
+        yield line_no + 1, pending.rstrip(b"\r")
+
+async def iter_ndjson_records(lines: AsyncIterator[Tuple[int, bytes]]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (line number, parsed value) for each non-blank NDJSON line.
+
+    Lines that are not valid UTF-8 or not valid JSON are yielded as the
+    exception instead."""
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line.decode("utf-8"))
+        except ValueError as e:  # UnicodeDecodeError is a ValueError
+            value = e
+        yield line_no, value
+
+async def iter_csv_records(lines: AsyncIterator[Tuple[int, bytes]]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (line number, row dict) for each CSV record after the header.
+
+    A record continues over several lines while it has an unbalanced
+    number of quote characters (a quoted field containing a newline); its
+    line number is the one it starts on. A record with a line that is not
+    valid UTF-8 is yielded as the exception instead."""
+    header = None
+    record: List[str] = []
+    start = 0
+    async for line_no, line in lines:
+        if not record:
+            start = line_no
+        try:
+            line = line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            record = []
+            yield start, e
+            continue
+        record.append(line)
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            continue
+        record = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        yield start, dict(zip(header, values))
+    if record:
+        yield start, ValueError("Unterminated quoted field")
+
+def _csv_to_item(row: Dict[str, str]) -> Dict[str, Any]:
+    """Map CSV strings (as written by the export) onto ItemCreate fields."""
+    data: Dict[str, Any] = {"title": row.get("title")}
+    if row.get("description"):
+        data["description"] = row["description"]
+    if row.get("is_active"):
+        data["is_active"] = row["is_active"]
+    return data
+
+def start_import(import_id: Optional[str], format: str) -> models.ItemImport:
+    """Load the progress of `import_id`, or register a new import."""
+    db = SessionLocal()
+    try:
+        job = db.get(models.ItemImport, import_id) if import_id else None
+        if job is None:
+            job = models.ItemImport(id=import_id or uuid.uuid4().hex, format=format, committed_line=0, imported=0, failed=0)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+def commit_chunk(import_id: str, rows: List[Tuple[int, Dict[str, Any]]], last_line: int, failed_before: int) -> List[Dict[str, Any]]:
+    """Insert one chunk of validated rows and record progress in the same transaction.
+
+    Returns the rows the database rejected as {"line", "error"} entries."""
+    db: Session = SessionLocal()
+    try:
+        created, failed = bulk_insert_items(db, [row for _, row in rows])
+        failed = [{"line": rows[f["index"]][0], "error": f["error"]} for f in failed]
+        job = db.get(models.ItemImport, import_id)
+        job.committed_line = last_line
+        job.imported += len(rows) - len(failed)
+        job.failed += failed_before + len(failed)
+        db.commit()
+        return failed
+    finally:
+        db.close()
+
+async def import_items(
+    chunks: AsyncIterator[bytes],
+    format: str,
+    import_id: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Import items from a streamed NDJSON or CSV body.
+
+    Rows are validated against ItemCreate as they arrive and committed in
+    chunks of `chunk_size`. The body is not read further until the current
+    chunk is committed, so a slow database pushes back on the client
+    instead of buffering the upload. Lines up to the import's
+    committed_line are skipped, so re-sending the same body with the same
+    import_id resumes after the last committed chunk."""
+    started = time.perf_counter()
+    job = await run_in_threadpool(start_import, import_id, format)
+    resume_after = job.committed_line
+
+    parse = iter_csv_records if format == "csv" else iter_ndjson_records
+    summary = {
+        "import_id": job.id,
+        "received": 0,
+        "imported": 0,
+        "failed_count": 0,
+        "failed": [],
+        "skipped": 0,
+        "committed_line": resume_after,
+    }
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    pending_failed = 0
+    last_line = resume_after
+
+    def fail(line_no: int, error: str):
+        summary["failed_count"] += 1
+        if len(summary["failed"]) < IMPORT_MAX_REPORTED_FAILURES:
+            summary["failed"].append({"line": line_no, "error": error})
+
+    async def flush():
+        nonlocal pending, pending_failed
+        failed = await run_in_threadpool(commit_chunk, job.id, pending, last_line, pending_failed)
+        for f in failed:
+            fail(f["line"], f["error"])
+        summary["imported"] += len(pending) - len(failed)
+        summary["committed_line"] = last_line
+        pending = []
+        pending_failed = 0
+
+    async for line_no, record in parse(iter_lines(chunks)):
+        if line_no <= resume_after:
+            summary["skipped"] += 1
+            continue
+        summary["received"] += 1
+        last_line = line_no
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if format == "csv":
+                record = _csv_to_item(record)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            pending.append((line_no, ItemCreate(**record).dict()))
+        except (ValueError, ValidationError) as e:
+            fail(line_no, str(e))
+            pending_failed += 1
+        if len(pending) >= chunk_size:
+            await flush()
+
+    if pending or pending_failed:
+        await flush()
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["received"] / elapsed, 1) if elapsed else 0.0
+    return summary
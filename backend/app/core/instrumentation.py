@@ -0,0 +1,152 @@
+from contextvars import ContextVar
+from sqlalchemy import event
+from typing import Optional
+import asyncio
+import os
+import time
+
+import logging
+slow_query_logger = logging.getLogger("slow_query")
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+# Statements slower than this are logged to the slow_query logger
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_MAX_CHARS = 1000
+
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of the response",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per request",
+    ["method", "route"],
+    buckets=COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per request",
+    ["method", "route"],
+)
+DB_QUERIES = Counter("db_queries_total", "Database statements executed", ["engine"])
+DB_QUERY_DURATION = Histogram("db_query_duration_seconds", "Database statement execution time", ["engine"])
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS", ["engine"])
+HTTP_REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "Requests being handled, event streams excepted")
+
+# Responses that stay open until the client leaves (the MCP SSE endpoint);
+# they are not waited for at shutdown
+EVENT_STREAM = b"text/event-stream"
+
+class RequestStats:
+    """Database work done while handling one request."""
+    __slots__ = ("scope", "queries", "db_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# Set by the middleware for the duration of a request. Handlers running in
+# the threadpool or in SQLAlchemy's async greenlets see a copy of the
+# context, so the object is mutated rather than replaced.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def route_label(scope) -> str:
+    """Path template of the matched route, e.g. /api/items/{item_id}.
+
+    Unmatched paths share one label so probes of random URLs cannot grow
+    the number of series."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and database work per route.
+
+    Timing stops when the last body chunk is sent, so streamed responses
+    are measured in full. Also counts the requests in progress, which
+    drain() waits for at shutdown; a request stops counting once it starts
+    an event stream, which only ends when its client disconnects."""
+    in_progress = 0
+
+    def __init__(self, app):
+        self.app = app
+        HTTP_REQUESTS_IN_PROGRESS.set_function(lambda: MetricsMiddleware.in_progress)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        MetricsMiddleware.in_progress += 1
+        counted = True
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, counted
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if counted and content_type.startswith(EVENT_STREAM):
+                    MetricsMiddleware.in_progress -= 1
+                    counted = False
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if counted:
+                MetricsMiddleware.in_progress -= 1
+            _request_stats.reset(token)
+            method = scope["method"]
+            route = route_label(scope)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route, status=status)
+            HTTP_REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+            HTTP_REQUEST_DB_TIME.observe(stats.db_seconds, method=method, route=route)
+
+async def drain(timeout: float) -> int:
+    """Wait up to `timeout` seconds for the requests in progress to finish.
+
+    Returns the number of requests still running when it gave up."""
+    deadline = time.monotonic() + timeout
+    while MetricsMiddleware.in_progress and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return MetricsMiddleware.in_progress
+
+def instrument_queries(engine, name: str) -> None:
+    """Count and time every statement `engine` executes.
+
+    Pass the sync_engine of an AsyncEngine. Statements slower than
+    SLOW_QUERY_MS are logged with the route that issued them."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERIES.inc(engine=name)
+        DB_QUERY_DURATION.observe(elapsed, engine=name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            DB_SLOW_QUERIES.inc(engine=name)
+            route = route_label(stats.scope) if stats is not None else "-"
+            slow_query_logger.warning(
+                f"{elapsed * 1000:.1f} ms on {name} ({route}): {' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]}"
+            )
+
+    # A failed statement never reaches after_cursor_execute
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
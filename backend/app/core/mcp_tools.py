@@ -0,0 +1,74 @@
+from fastapi_mcp import FastApiMCP
+from mcp import types
+from typing import Any, List, Optional
+import json
+import os
+
+# Longest text a tool call returns. Larger JSON results are cut to the list
+# elements that fit, so agents are not handed results that fill their context.
+MCP_MAX_RESULT_CHARS = int(os.environ.get("MCP_MAX_RESULT_CHARS", "20000"))
+
+TRUNCATED_NOTE = "[Truncated: {shown} of {total} {what} shown. Ask for fewer items (limit, item_ids) or fewer fields.]"
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def _largest_list(result: Any) -> Optional[list]:
+    """The list an oversized result is made of: the result itself or its longest list value."""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        lists = [value for value in result.values() if isinstance(value, list)]
+        if lists:
+            return max(lists, key=len)
+    return None
+
+def limit_result(text: str, max_chars: int = MCP_MAX_RESULT_CHARS) -> str:
+    """Compact a JSON tool result and cut it down to `max_chars`.
+
+    JSON is re-encoded without indentation. If it is still too long, elements
+    are dropped from the end of its largest list so the result stays valid
+    JSON, followed by a note saying how many were left out. Other text is cut
+    at `max_chars`."""
+    try:
+        result = json.loads(text)
+    except ValueError:
+        result = None
+    compact = text if result is None else _dumps(result)
+    if len(compact) <= max_chars:
+        return compact
+    items = _largest_list(result)
+    if not items:
+        return compact[:max_chars] + "\n" + TRUNCATED_NOTE.format(shown=max_chars, total=len(compact), what="characters")
+
+    total = len(items)
+    encoded = [_dumps(item) for item in items]
+    # Everything but the list elements and the commas between them
+    budget = max_chars - (len(compact) - sum(map(len, encoded)) - (total - 1))
+    shown = 0
+    for item in encoded:
+        budget -= len(item) + (1 if shown else 0)
+        if budget < 0:
+            break
+        shown += 1
+    del items[shown:]
+    return _dumps(result) + "\n" + TRUNCATED_NOTE.format(shown=shown, total=total, what="items")
+
+class ItemsMCP(FastApiMCP):
+    """FastApiMCP with tool results limited by limit_result.
+
+    Tool calls are dispatched to the app in-process through
+    httpx.ASGITransport, so they do not go over the network."""
+
+    def __init__(self, *args, max_result_chars: int = MCP_MAX_RESULT_CHARS, **kwargs):
+        self.max_result_chars = max_result_chars
+        super().__init__(*args, **kwargs)
+
+    # fastapi_mcp has no hook for tool results, so wrap the method producing them
+    async def _execute_api_tool(self, *args, **kwargs) -> List[Any]:
+        contents = await super()._execute_api_tool(*args, **kwargs)
+        return [
+            types.TextContent(type="text", text=limit_result(content.text, self.max_result_chars))
+            if isinstance(content, types.TextContent) else content
+            for content in contents
+        ]
@@ -0,0 +1,150 @@
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Any, List, Literal, Optional, Sequence, Tuple, get_args
+import base64
+import json
+
+from app.models import models
+from app.schemas.item import ItemFilter
+
+SortKey = Literal["id", "-id", "created_at", "-created_at", "updated_at", "-updated_at", "title", "-title"]
+SORT_KEYS = get_args(SortKey)
+
+# Whitelisted sort columns; each is backed by an index (see models.Item)
+SORT_COLUMNS = {
+    "id": models.Item.id,
+    "created_at": models.Item.created_at,
+    "updated_at": models.Item.updated_at,
+    "title": models.Item.title,
+}
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+def _sort_column(sort: str):
+    """Return (column, descending) for a sort key such as "-created_at"."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort key: {sort}")
+    return SORT_COLUMNS[sort.lstrip("-")], sort.startswith("-")
+
+def _utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def title_prefix_bounds(prefix: str) -> Tuple[str, str]:
+    """Half-open range [low, high) of the strings starting with `prefix`.
+
+    A range rather than LIKE 'prefix%' can use the title index on every
+    backend and needs no escaping of % and _."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def apply_filters(stmt: Select, filters: Optional[ItemFilter]) -> Select:
+    """Add the WHERE clauses of `filters` to an item query.
+
+    *_after bounds are inclusive and *_before bounds exclusive."""
+    if filters is None:
+        return stmt
+    if filters.is_active is not None:
+        stmt = stmt.where(models.Item.is_active == filters.is_active)
+    if filters.created_after is not None:
+        stmt = stmt.where(models.Item.created_at >= _utc(filters.created_after))
+    if filters.created_before is not None:
+        stmt = stmt.where(models.Item.created_at < _utc(filters.created_before))
+    if filters.updated_after is not None:
+        stmt = stmt.where(models.Item.updated_at >= _utc(filters.updated_after))
+    if filters.updated_before is not None:
+        stmt = stmt.where(models.Item.updated_at < _utc(filters.updated_before))
+    if filters.title_prefix:
+        low, high = title_prefix_bounds(filters.title_prefix)
+        stmt = stmt.where(models.Item.title >= low, models.Item.title < high)
+    return stmt
+
+def sorted_items(filters: Optional[ItemFilter] = None, sort: str = "id", columns: Optional[Sequence] = None) -> Select:
+    """Filtered item query ordered by `sort`, with the id as tie-breaker.
+
+    Selects Item objects, or only `columns` when given; deleted items are left out."""
+    column, descending = _sort_column(sort)
+    order = [column.desc(), models.Item.id.desc()] if descending else [column, models.Item.id]
+    if column is models.Item.id:
+        order = order[:1]
+    stmt = select(*columns) if columns else select(models.Item)
+    stmt = stmt.where(models.Item.deleted_at.is_(None))
+    return apply_filters(stmt, filters).order_by(*order)
+
+def encode_cursor(last_id: int, sort: str = "id", key: Any = None) -> str:
+    """Build an opaque cursor pointing just after the item with `last_id`.
+
+    For sorts other than id the cursor also carries the sort key and the
+    item's value of it."""
+    payload = {"id": last_id}
+    if sort != "id":
+        payload["sort"] = sort
+        payload["key"] = key.isoformat() if isinstance(key, datetime) else key
+    payload = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str = "id") -> Tuple[int, Any]:
+    """Return the item id and sort key value a cursor points after."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = payload["id"]
+        key = payload.get("key")
+        if payload.get("sort", "id") != sort:
+            raise ValueError("cursor belongs to another sort order")
+        if key is not None and SORT_COLUMNS[sort.lstrip("-")] is not models.Item.title:
+            key = datetime.fromisoformat(key)
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(last_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return last_id, key
+
+def _after(sort: str, last_id: int, key: Any):
+    """WHERE clause selecting the rows that follow (key, last_id) in `sort` order.
+
+    NULLs sort first in ascending and last in descending order, on both
+    SQLite and MariaDB."""
+    column, descending = _sort_column(sort)
+    id_after = models.Item.id < last_id if descending else models.Item.id > last_id
+    if column is models.Item.id:
+        return id_after
+    if key is None:
+        ties = and_(column.is_(None), id_after)
+        return ties if descending else or_(column.is_not(None), ties)
+    # The redundant inclusive bound lets the database seek the index
+    if descending:
+        return or_(and_(column <= key, or_(column < key, and_(column == key, id_after))), column.is_(None))
+    return and_(column >= key, or_(column > key, and_(column == key, id_after)))
+
+def keyset_page(
+    db: Session,
+    cursor: Optional[str],
+    limit: int,
+    filters: Optional[ItemFilter] = None,
+    sort: str = "id",
+    columns: Optional[Sequence] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch the page of items after `cursor` in `sort` order.
+
+    Seeks on (sort key, id) instead of using OFFSET, so every page costs
+    the same regardless of depth. Returns the items and the cursor of the
+    next page, or None when there are no more items. Items are Item
+    objects, or rows of `columns` when given (which must include the id
+    and the sort column). `limit` must be at least 1: an empty page would
+    have no next cursor, which reads as the end of the listing."""
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    stmt = sorted_items(filters, sort, columns).limit(limit + 1)
+    if cursor:
+        stmt = stmt.where(_after(sort, *decode_cursor(cursor, sort)))
+    items = list(db.execute(stmt).all() if columns else db.scalars(stmt))
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last.id, sort, getattr(last, sort.lstrip("-")))
+    return items, next_cursor
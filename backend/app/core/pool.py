@@ -0,0 +1,93 @@
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, Dict, Tuple
+import os
+import time
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_OVERFLOW_EVENTS = Counter("db_pool_overflow_total", "Connections opened beyond pool_size", ["pool"])
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after pool_timeout", ["pool"])
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out", ["pool"])
+POOL_IDLE = Gauge("db_pool_connections_idle", "Connections idle in the pool", ["pool"])
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Overflow connections currently open", ["pool"])
+POOL_SIZE = Gauge("db_pool_size", "Configured pool_size", ["pool"])
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+def pool_options() -> Dict[str, Any]:
+    """Pool settings for create_engine, read from DB_POOL_* environment variables.
+
+    DB_POOL_RECYCLE must stay below MariaDB's wait_timeout so the server
+    never closes a connection the pool still considers usable."""
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": env_flag("DB_POOL_PRE_PING", True),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+    }
+
+def pool_limits(max_connections: int, processes: int, engines: int, pool_size: int, max_overflow: int) -> Tuple[int, int]:
+    """pool_size and max_overflow for each of `engines` pools in each of `processes`
+    processes, so that all of them together open at most `max_connections`.
+
+    max_overflow is cut before pool_size; each pool keeps at least one connection."""
+    per_pool = max(1, max_connections // max(1, processes * engines))
+    pool_size = max(1, min(pool_size, per_pool))
+    max_overflow = max(0, min(max_overflow, per_pool - pool_size))
+    return pool_size, max_overflow
+
+class _InstrumentedPoolMixin:
+    """Records checkout wait time, timeouts and overflow events of a QueuePool."""
+    metrics_name = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    def _inc_overflow(self):
+        # _overflow counts up from -pool_size; above zero the pool has grown
+        # past pool_size into max_overflow
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            POOL_OVERFLOW_EVENTS.inc(pool=self.metrics_name)
+        return opened
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def instrument_engine(engine, name: str) -> None:
+    """Label the engine's pool metrics with `name` and register its gauges.
+
+    Gauges read `engine.pool` on every scrape, so they follow the pool
+    that engine.dispose() puts in place."""
+    engine.pool.metrics_name = name
+    POOL_IN_USE.set_function(lambda: engine.pool.checkedout(), pool=name)
+    POOL_IDLE.set_function(lambda: engine.pool.checkedin(), pool=name)
+    POOL_OVERFLOW.set_function(lambda: max(0, engine.pool.overflow()), pool=name)
+    POOL_SIZE.set_function(lambda: engine.pool.size(), pool=name)
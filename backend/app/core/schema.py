@@ -0,0 +1,30 @@
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+from typing import List
+
+import logging
+logger = logging.getLogger("schema")
+
+def add_missing_columns(connection: Connection, metadata: MetaData) -> List[str]:
+    """Add the columns of `metadata` missing from existing tables and return them as table.column.
+
+    create_all only creates missing tables, so columns added to a model
+    after its table was created are added here with ALTER TABLE, using the
+    column's server default to fill the existing rows. Run before creating
+    the indexes, which may cover the new columns."""
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            logger.info(f"Adding column {table.name}.{column.name}")
+            connection.exec_driver_sql(f"ALTER TABLE {connection.dialect.identifier_preparer.format_table(table)} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+    return added
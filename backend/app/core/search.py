@@ -0,0 +1,130 @@
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+import html
+import re
+
+import logging
+logger = logging.getLogger("search")
+
+from app.core import database_mysql, database_sqlite
+from app.core.bulk import RETURNED_COLUMNS
+from app.models import models
+
+SEARCH_MAX_LIMIT = 100
+# Characters of context kept around the first match of a snippet
+SNIPPET_CHARS = 80
+HIGHLIGHT = ("<mark>", "</mark>")
+# BM25 weight of a title match relative to a description match
+TITLE_WEIGHT = 10.0
+
+class InvalidQuery(ValueError):
+    pass
+
+def install_search_index(connection: Connection) -> None:
+    """Create the full-text index of the items table if it does not exist yet.
+
+    SQLite gets an FTS5 table kept in sync by triggers, which is filled from
+    the existing rows when it is first created; MariaDB gets a FULLTEXT index."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": database_sqlite.SEARCH_TABLE}
+        ).first()
+        for statement in database_sqlite.SEARCH_DDL:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            logger.info("Building full-text index of existing items...")
+            connection.exec_driver_sql(f"INSERT INTO {database_sqlite.SEARCH_TABLE}({database_sqlite.SEARCH_TABLE}) VALUES ('rebuild')")
+    elif dialect == "mysql":
+        for statement in database_mysql.SEARCH_DDL:
+            connection.exec_driver_sql(statement)
+    else:
+        logger.warning(f"Full-text search is not supported on {dialect}")
+
+def query_terms(query: str) -> List[str]:
+    """Split a user query into lower-case words; operators and punctuation are dropped."""
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        raise InvalidQuery("Search query must contain at least one word")
+    return terms
+
+# Both backends use the same semantics: every word must match and the last
+# one also matches as a prefix, so results narrow as the user types.
+
+def fts5_query(terms: List[str]) -> str:
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+def boolean_mode_query(terms: List[str]) -> str:
+    # Required words that are too short to be indexed would match nothing;
+    # the last one is a prefix, which may be shorter than an indexed word
+    indexed = [term for term in terms[:-1] if len(term) >= 3] + terms[-1:]
+    return " ".join(f"+{term}" for term in indexed) + "*"
+
+def highlight(value: Optional[str], terms: List[str], width: int = SNIPPET_CHARS) -> Optional[str]:
+    """HTML-escaped excerpt of `value` around the first match, with matches wrapped in <mark>.
+
+    Returns None when no term occurs in `value`."""
+    if not value:
+        return None
+    words = [re.escape(term) + r"\b" for term in terms[:-1]] + [re.escape(terms[-1]) + r"\w*"]
+    pattern = re.compile(r"\b(?:" + "|".join(words) + ")", re.IGNORECASE)
+    first = pattern.search(value)
+    if first is None:
+        return None
+    start = max(0, first.start() - width // 2)
+    end = min(len(value), start + width)
+    excerpt = value[start:end]
+    parts = []
+    position = 0
+    for m in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[position:m.start()]))
+        parts.append(HIGHLIGHT[0] + html.escape(m.group()) + HIGHLIGHT[1])
+        position = m.end()
+    parts.append(html.escape(excerpt[position:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(value) else "")
+
+def _sqlite_search(db: Session, terms: List[str], limit: int, offset: int):
+    fts = table(database_sqlite.SEARCH_TABLE, column("rowid"))
+    # bm25() is lower for better matches
+    rank = func.bm25(literal_column(database_sqlite.SEARCH_TABLE), TITLE_WEIGHT, 1.0)
+    stmt = (
+        select(*RETURNED_COLUMNS, (-rank).label("score"))
+        .select_from(fts.join(models.Item.__table__, models.Item.id == fts.c.rowid))
+        .where(literal_column(database_sqlite.SEARCH_TABLE).op("MATCH")(fts5_query(terms)), models.Item.deleted_at.is_(None))
+        .order_by(rank, models.Item.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return db.execute(stmt)
+
+def _mysql_search(db: Session, terms: List[str], limit: int, offset: int):
+    score = match(models.Item.title, models.Item.description, against=boolean_mode_query(terms)).in_boolean_mode()
+    stmt = (
+        select(*RETURNED_COLUMNS, score.label("score"))
+        .where(score, models.Item.deleted_at.is_(None))
+        .order_by(score.desc(), models.Item.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return db.execute(stmt)
+
+def search_items(db: Session, query: str, limit: int, offset: int = 0) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Rank items against `query` using the full-text index.
+
+    Returns (hits, next_offset). Each hit is an item row plus its relevance
+    `score` (higher is better) and highlighted title/description snippets;
+    next_offset is None on the last page."""
+    terms = query_terms(query)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    search = _mysql_search if db.get_bind().dialect.name == "mysql" else _sqlite_search
+    rows = [dict(r._mapping) for r in search(db, terms, limit + 1, offset)]
+
+    next_offset = offset + limit if len(rows) > limit else None
+    hits = rows[:limit]
+    for hit in hits:
+        hit["title_snippet"] = highlight(hit["title"], terms)
+        hit["description_snippet"] = highlight(hit["description"], terms)
+    return hits, next_offset
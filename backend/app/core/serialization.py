@@ -0,0 +1,55 @@
+from datetime import datetime
+from pydantic import TypeAdapter
+from typing import Any, Iterable, List, Optional, Sequence
+from typing_extensions import TypedDict
+
+from app.core.pool import env_flag
+from app.models import models
+from app.schemas.item import ItemResponse
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to pydantic's serializer
+    orjson = None
+
+# Serve item listings from column tuples encoded straight to JSON, instead of
+# validating every ORM object into an ItemResponse and encoding that. The
+# route keeps response_model=ItemResponse, so the OpenAPI schema is unchanged.
+FAST_JSON = env_flag("FAST_JSON", False)
+
+# Columns in ItemResponse field order, so the JSON matches the model's byte for byte
+ITEM_FIELDS = list(ItemResponse.model_fields)
+ITEM_COLUMNS = tuple(getattr(models.Item, name) for name in ITEM_FIELDS)
+
+class ItemRow(TypedDict):
+    title: str
+    description: Optional[str]
+    is_active: Optional[bool]
+    id: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    version: int
+
+class ItemRowPage(TypedDict):
+    items: List[ItemRow]
+    next_cursor: Optional[str]
+
+# Built once: serializes plain dicts by schema, without validating them
+ITEM_ROWS = TypeAdapter(List[ItemRow])
+ITEM_ROW_PAGE = TypeAdapter(ItemRowPage)
+
+def _dicts(rows: Iterable[Sequence[Any]]) -> List[dict]:
+    return [dict(zip(ITEM_FIELDS, row)) for row in rows]
+
+def items_json(rows: Iterable[Sequence[Any]]) -> bytes:
+    """JSON array of ItemResponse objects from rows of ITEM_COLUMNS."""
+    if orjson is not None:
+        return orjson.dumps(_dicts(rows))
+    return ITEM_ROWS.dump_json(_dicts(rows))
+
+def item_page_json(rows: Iterable[Sequence[Any]], next_cursor: Optional[str]) -> bytes:
+    """JSON ItemPage object from rows of ITEM_COLUMNS."""
+    page = {"items": _dicts(rows), "next_cursor": next_cursor}
+    if orjson is not None:
+        return orjson.dumps(page)
+    return ITEM_ROW_PAGE.dump_json(page)
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.models import models
+
+# Item counts kept in item_daily_stats: one row per creation day with the
+# number of existing items created that day, split by is_active. Every write
+# path adjusts them in its own transaction, so reading the stats costs one
+# row per day instead of a scan of the items table.
+
+Stats = models.ItemDailyStats
+
+def _add(db: Session, day: Any, active: int, inactive: int) -> None:
+    """Add to the counts of `day` (a date or a SQL date expression)."""
+    if not active and not inactive:
+        return
+    stmt = (
+        update(Stats)
+        .where(Stats.day == day)
+        .values(active=Stats.active + active, inactive=Stats.inactive + inactive)
+    )
+    if db.execute(stmt).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(Stats).values(day=day, active=active, inactive=inactive))
+    except IntegrityError:
+        db.execute(stmt)  # created concurrently
+
+def _add_by_day(db: Session, deltas: Dict[date, List[int]]) -> None:
+    for day, (active, inactive) in sorted(deltas.items()):
+        _add(db, day, active, inactive)
+
+def record_created(db: Session, active: int, inactive: int) -> None:
+    """Count items inserted by the current transaction.
+
+    New rows get created_at from the database clock, so they are counted
+    on the database's CURRENT_DATE rather than the application's."""
+    _add(db, func.current_date(), active, inactive)
+
+def record_deleted(db: Session, rows: Iterable[Tuple[datetime, bool]]) -> None:
+    """Uncount deleted items, given as (created_at, is_active) pairs."""
+    deltas = defaultdict(lambda: [0, 0])
+    for created_at, is_active in rows:
+        if created_at is not None:
+            deltas[created_at.date()][0 if is_active else 1] -= 1
+    _add_by_day(db, deltas)
+
+def record_toggled(db: Session, rows: Iterable[Tuple[datetime, bool]]) -> None:
+    """Move items whose is_active flipped, given as (created_at, new is_active) pairs."""
+    deltas = defaultdict(lambda: [0, 0])
+    for created_at, is_active in rows:
+        if created_at is not None:
+            sign = 1 if is_active else -1
+            deltas[created_at.date()][0] += sign
+            deltas[created_at.date()][1] -= sign
+    _add_by_day(db, deltas)
+
+def rebuild_stats(db: Session) -> None:
+    """Recompute every count from the items table.
+
+    Used to fill the stats of a database created before they existed, or
+    to repair them after rows were changed outside the API."""
+    day = func.date(models.Item.created_at, type_=Stats.day.type)
+    db.execute(delete(Stats))
+    db.execute(
+        insert(Stats).from_select(
+            ["day", "active", "inactive"],
+            select(
+                day,
+                func.sum(case((models.Item.is_active, 1), else_=0)),
+                func.sum(case((models.Item.is_active, 0), else_=1)),
+            )
+            .where(models.Item.created_at.is_not(None), models.Item.deleted_at.is_(None))
+            .group_by(day),
+        )
+    )
+
+def ensure_stats(db: Session) -> None:
+    """Rebuild the stats if the table is empty but items exist."""
+    if db.execute(select(Stats.day).limit(1)).first() is None and db.execute(select(models.Item.id).limit(1)).first() is not None:
+        rebuild_stats(db)
+
+def item_stats(db: Session, days: int) -> Dict[str, Any]:
+    """Total/active/inactive counts and items per creation day for the latest `days` days with items."""
+    active, inactive = db.execute(select(func.coalesce(func.sum(Stats.active), 0), func.coalesce(func.sum(Stats.inactive), 0))).one()
+    count = Stats.active + Stats.inactive
+    per_day = db.execute(select(Stats.day, count).where(count > 0).order_by(Stats.day.desc()).limit(days))
+    return {
+        "total": active + inactive,
+        "active": active,
+        "inactive": inactive,
+        "created_per_day": [{"day": day, "count": n} for day, n in per_day],
+    }
@@ -0,0 +1,60 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
+
+from app.models import models
+
+ITEMS = "items"
+
+def ensure_version(db: Session, name: str = ITEMS) -> None:
+    """Create the version row of `name` if it does not exist yet."""
+    if db.get(models.TableVersion, name) is None:
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.TableVersion).values(name=name, version=0))
+        except IntegrityError:
+            pass  # created concurrently
+
+def bump_version(db: Session, name: str = ITEMS) -> int:
+    """Increment the version of `name` as part of the current transaction and return it.
+
+    Call from every transaction that writes to the table, after its other
+    writes and right before commit (for items, through
+    app.core.bulk.stamp_changes). Readers compare versions to tell whether
+    anything changed, without reading the table itself. The version row
+    stays locked until commit, so transactions writing the table commit in
+    version order and the returned version can be stored as the change
+    sequence of the rows written."""
+    result = db.execute(
+        update(models.TableVersion)
+        .where(models.TableVersion.name == name)
+        .values(version=models.TableVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        ensure_version(db, name)
+        return bump_version(db, name)
+    return current_version(db, name)
+
+def current_version(db: Session, name: str = ITEMS) -> int:
+    """Committed version of `name`; a primary key lookup."""
+    version = db.execute(select(models.TableVersion.version).where(models.TableVersion.name == name)).scalar()
+    return version or 0
+
+def body_etag(body: bytes) -> str:
+    """Weak ETag of a serialized response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def version_etag(version: int) -> str:
+    """Weak ETag of a response derived only from the table version."""
+    return f'W/"v{version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, configure_mappers
+from typing import Optional
+import os
+import time
+
+import logging
+logger = logging.getLogger("startup")
+
+from app.core.bulk import bulk_get_items
+from app.core.metrics import Gauge
+from app.core.pool import env_flag
+from app.core.pagination import _after, keyset_page, sorted_items
+from app.core.serialization import FAST_JSON, ITEM_COLUMNS
+from app.core.stats import item_stats
+from app.core.versioning import current_version
+from app.models import models
+
+# Open pool connections and compile the hot statements at startup
+STARTUP_WARMUP = env_flag("STARTUP_WARMUP", True)
+# Pool connections opened at startup; defaults to each pool's pool_size
+DB_WARM_CONNECTIONS = os.environ.get("DB_WARM_CONNECTIONS")
+
+STARTUP_SECONDS = Gauge("app_startup_seconds", "Time taken by each startup phase", ["phase"])
+
+@contextmanager
+def startup_phase(name: str):
+    """Time a startup phase into app_startup_seconds and the startup log."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    STARTUP_SECONDS.set(elapsed, phase=name)
+    logger.info(f"Startup {name}: {elapsed * 1000:.1f} ms")
+
+def _warm_count(engine: Engine, connections: Optional[int]) -> int:
+    # Only a QueuePool keeps connections around; never ask for more than it
+    # holds, or the in-memory SQLite pool (one connection) would block
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 0
+    if connections is None:
+        connections = int(DB_WARM_CONNECTIONS) if DB_WARM_CONNECTIONS else size
+    return max(0, min(connections, size))
+
+def warm_pool(engine: Engine, connections: Optional[int] = None) -> int:
+    """Open up to `connections` pool connections at once and return them to the pool.
+
+    Connecting (and the per-connection setup hooks) then happens before the
+    first request instead of during it. Returns the number of connections opened."""
+    opened = []
+    try:
+        for _ in range(_warm_count(engine, connections)):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+async def warm_async_pool(engine: AsyncEngine, connections: Optional[int] = None) -> int:
+    """warm_pool for an AsyncEngine."""
+    opened = []
+    try:
+        for _ in range(_warm_count(engine.sync_engine, connections)):
+            connection = await engine.connect()
+            opened.append(connection)
+            await connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+def warm_statements(db: Session) -> None:
+    """Run the statements of the hot read paths once.
+
+    Each engine caches the compiled form of a statement the first time it
+    runs, so this moves the compilation out of the first requests. Lookups
+    use id 0, which never exists, so nothing is loaded."""
+    configure_mappers()
+    current_version(db)
+    db.query(models.Item).filter(models.Item.id == 0, models.Item.deleted_at.is_(None)).first()
+    # Listing: first page, next page and skip, as the listing handlers build them
+    columns = ITEM_COLUMNS if FAST_JSON else None
+    keyset_page(db, None, 1, columns=columns)
+    db.execute(sorted_items(None, "id", columns).where(_after("id", 0, None)).limit(2)).all()
+    db.execute(sorted_items(None, "id", columns).offset(1).limit(1)).all()
+    item_stats(db, 1)
+    bulk_get_items(db, [0])
+    db.rollback()
@@ -1,15 +1,79 @@
-from fastapi import FastAPI
-from fastapi_mcp import FastApiMCP
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import items
-from app.core.database import engine
+from app.core.database import engine, SessionLocal, ASYNC_MODE, async_engine, AsyncSessionLocal
+from app.core.schema import add_missing_columns
+from app.core.search import install_search_index
+from app.core.stats import ensure_stats
+from app.core.versioning import ensure_version
+from app.core.instrumentation import MetricsMiddleware, drain
+from app.core.metrics import render_metrics
+from app.core.mcp_tools import ItemsMCP
+from app.core.warmup import STARTUP_WARMUP, startup_phase, warm_async_pool, warm_pool, warm_statements
 from app.models import models
+import os
+
+import logging
+logger = logging.getLogger("main")
+
+# Longest wait at shutdown for requests still in progress
+SHUTDOWN_DRAIN_SECONDS = float(os.environ.get("SHUTDOWN_DRAIN_SECONDS", "10"))
+
+def create_schema():
+    """Create missing tables, columns, indexes, the search index and the version and stats rows."""
+    models.Base.metadata.create_all(bind=engine)
+    # create_all leaves existing tables alone; add columns and indexes declared since
+    with engine.begin() as connection:
+        add_missing_columns(connection, models.Base.metadata)
+    for index in models.Item.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        install_search_index(connection)
+    with SessionLocal() as db:
+        ensure_version(db)
+        ensure_stats(db)
+        db.commit()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database before the first request and release it after the last one.
+
+    Startup opens the pool connections and compiles the hot statements, so
+    the first requests after a deploy do not pay for them. Phase timings go
+    to the startup log and the app_startup_seconds metric."""
+    with startup_phase("total"):
+        with startup_phase("schema"):
+            create_schema()
+        if STARTUP_WARMUP:
+            with startup_phase("pool"):
+                opened = warm_pool(engine)
+                if async_engine is not None:
+                    opened += await warm_async_pool(async_engine)
+            with startup_phase("statements"):
+                with SessionLocal() as db:
+                    warm_statements(db)
+                if AsyncSessionLocal is not None:
+                    async with AsyncSessionLocal() as db:
+                        await db.run_sync(warm_statements)
+            logger.info(f"Warmed up {opened} pooled connections")
+
+    yield
+
+    # The server stops accepting requests before shutdown; let running ones finish
+    remaining = await drain(SHUTDOWN_DRAIN_SECONDS)
+    if remaining:
+        logger.warning(f"Shutting down with {remaining} requests still in progress")
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(
     title="CRUD API",
     description="A CRUD API with FastAPI and SQLAlchemy",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Middleware for CORS
@@ -22,28 +86,29 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Per-route latency and database statement counts, exported at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
+if ASYNC_MODE:
+    from app.routers import items_async
+    items_async.replace_routes(items.router)
 app.include_router(items.router, prefix="/api")
 
-# TODO: substitute deprecated method
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup."""
-    models.Base.metadata.create_all(bind=engine)
-    
-# TODO: substitute deprecated method
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up database connections on shutdown."""
-    # If using a connection pool or need to close anything explicitly, do it here
-    pass
-
 # Set up MCP server with explicit path and configuration
-mcp = FastApiMCP(app)
+# Streamed exports and raw-body imports only make sense over HTTP;
+# agents get export_items_sample and create_items_batch instead.
+# Tool calls run in-process and results longer than MCP_MAX_RESULT_CHARS are truncated
+mcp = ItemsMCP(app, exclude_operations=["export_items", "import_items"])
 
 # Mount MCP server
 mcp.mount()
 
+# Prometheus scrape endpoint, kept out of the OpenAPI schema and MCP tools
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Root endpoint for basic health check
 @app.get("/")
 def read_root():
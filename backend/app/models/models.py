@@ -1,7 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Boolean, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# SQLite stores CURRENT_TIMESTAMP as text without fractional seconds; bind
+# datetimes in the same format so filters and cursors compare correctly
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class Item(Base):
     __tablename__ = "items"
 
@@ -9,5 +17,51 @@ class Item(Base):
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
+    # Incremented by every update; clients send it back as an update precondition
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Set when the item is deleted; deleted items are kept as tombstones for the changes feed
+    deleted_at = Column(Timestamp, nullable=True)
+    # Items version (see app.core.versioning) of the transaction that last wrote the row
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    # Filters and sort keys of the item listing (see app.core.pagination).
+    # The primary key is implicitly the last column of every index, which
+    # keeps (sort key, id) keyset pages in index order.
+    __table_args__ = (
+        Index("ix_items_active_created", "is_active", "created_at"),
+        Index("ix_items_active_updated", "is_active", "updated_at"),
+        Index("ix_items_created", "created_at"),
+        Index("ix_items_updated", "updated_at"),
+        Index("ix_items_title", "title"),
+        # Changes feed: rows written after a given sequence, in (change_seq, id) order
+        Index("ix_items_change_seq", "change_seq"),
+    )
+
+class ItemImport(Base):
+    """Progress of a streaming import, committed together with each chunk of rows."""
+    __tablename__ = "item_imports"
+
+    id = Column(String(64), primary_key=True)
+    format = Column(String(10), nullable=False)
+    committed_line = Column(Integer, nullable=False, default=0)
+    imported = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class ItemDailyStats(Base):
+    """Number of existing items created on each day, maintained by every write path (see app.core.stats)."""
+    __tablename__ = "item_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    active = Column(Integer, nullable=False, default=0)
+    inactive = Column(Integer, nullable=False, default=0)
+
+class TableVersion(Base):
+    """Version number of a table, incremented in every transaction that writes to it."""
+    __tablename__ = "table_versions"
+
+    name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
\ No newline at end of file
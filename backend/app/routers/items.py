@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
 from app.core.database import get_db
+from app.core.bulk import bulk_get_items, bulk_insert_items, bulk_delete_items, bulk_update_items, stamp_changes
+from app.core.changes import CHANGES_MAX_LIMIT, changes_since
+from app.core.pagination import InvalidCursor, SortKey, keyset_page, sorted_items
+from app.core.export import EXPORT_MEDIA_TYPES, EXPORT_SAMPLE_MAX, EXPORT_WRITERS, export_sample
+from app.core.importer import import_items
+from app.core.serialization import FAST_JSON, ITEM_COLUMNS, item_page_json, items_json
+from app.core.stats import item_stats, record_created, record_deleted, record_toggled
+from app.core.search import SEARCH_MAX_LIMIT, InvalidQuery, search_items as run_search
+from app.core.cache import item_cache, item_key, invalidate_items
+from app.core.versioning import body_etag, current_version, etag_matches, version_etag
 from app.models import models
-from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse, BatchResponse, ItemBatchCreate, ItemBatchDelete
+from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse, BatchResponse, ItemBatchCreate, ItemBatchDelete, ItemBatchGet, ItemBatchGetResponse, ItemBatchUpdate, ItemChanges, ItemFilter, ItemPage, ItemStats, SearchResults, ExportSample, ImportProgress, ImportSummary
 import os
 router = APIRouter(tags=["items"], prefix="/items")
 
@@ -22,28 +34,15 @@ def create_items_batch(item_data: ItemBatchCreate, db: Session = Depends(get_db)
     """Create multiple items in a single request.
     
     This endpoint allows you to create multiple items at once.
+    Items are inserted in chunks with multi-row INSERT statements.
     If any item fails to create, it will be added to the failed list with an error message.
     Successful items will be committed to the database and returned in the success list."""
-    success_items = []
-    failed_items = []
-    
-    for idx, item_create in enumerate(item_data.items):
-        try:
-            db_item = models.Item(**item_create.dict())
-            db.add(db_item)
-            db.flush()  # Flush to get the ID without committing
-            success_items.append(db_item)
-        except Exception as e:
-            failed_items.append({
-                "index": idx,
-                "item": item_create.dict(),
-                "error": str(e)
-            })
+    rows = [item_create.dict() for item_create in item_data.items]
+    success_items, failed_items = bulk_insert_items(db, rows)
             
     if success_items:  # Only commit if there are successful items
         db.commit()
-        for item in success_items:
-            db.refresh(item)
+        invalidate_items(item["id"] for item in success_items)
             
     return BatchResponse(success=success_items, failed=failed_items)
 
@@ -53,29 +52,100 @@ def delete_items_batch(delete_data: ItemBatchDelete, db: Session = Depends(get_d
     
     This endpoint allows you to delete multiple items by their IDs.
     If an item doesn't exist or fails to delete, it will be added to the failed list.
-    Successfully deleted items will be returned in the success list before being removed from the database."""
-    success_items = []
-    failed_items = []
-    
-    for idx, item_id in enumerate(delete_data.item_ids):
-        try:
-            db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-            if db_item is None:
-                raise HTTPException(status_code=404, detail="Item not found")
-            success_items.append(db_item)
-            db.delete(db_item)
-        except Exception as e:
-            failed_items.append({
-                "index": idx,
-                "item_id": item_id,
-                "error": str(e)
-            })
+    Items are looked up and deleted with one statement per chunk of ids;
+    they are kept as tombstones in the changes feed.
+    Successfully deleted items are returned in the success list."""
+    success_items, failed_items = bulk_delete_items(db, delete_data.item_ids)
     
     if success_items:  # Only commit if there are successful deletions
         db.commit()
+        invalidate_items(item["id"] for item in success_items)
         
     return BatchResponse(success=success_items, failed=failed_items)
 
+@router.post("/batch/update", status_code=status.HTTP_200_OK, response_model=BatchResponse, operation_id="update_items_batch")
+def update_items_batch(update_data: ItemBatchUpdate, db: Session = Depends(get_db)):
+    """Update multiple items in a single request.
+    
+    Each entry holds the item ID and the fields to change (partial update).
+    Pass the item's current version to update it only if nobody changed it since;
+    a stale version is reported in the failed list as a 409 conflict, as are missing items (404).
+    Updates changing the same fields are applied together with one statement per chunk of items.
+    Updated items are returned in the success list with their new version."""
+    updates = [entry.dict(exclude_unset=True) for entry in update_data.items]
+    success_items, failed_items = bulk_update_items(db, updates)
+    
+    if success_items:  # Only commit if there are successful updates
+        db.commit()
+        invalidate_items(item["id"] for item in success_items)
+    
+    return BatchResponse(success=success_items, failed=failed_items)
+
+@router.post("/batch/get", status_code=status.HTTP_200_OK, response_model=ItemBatchGetResponse, response_model_exclude_unset=True, operation_id="read_items_batch")
+def read_items_batch(get_data: ItemBatchGet, db: Session = Depends(get_db)):
+    """Get multiple items by their IDs in a single request.
+    
+    Use this instead of calling read_item once per item.
+    Items are returned in the order of the given IDs; IDs that do not exist are listed in missing.
+    Pass fields (e.g. ["id", "title"]) to return only those fields of each item.
+    Items are looked up with one statement per chunk of ids."""
+    items, missing = bulk_get_items(db, get_data.item_ids, get_data.fields)
+    return ItemBatchGetResponse(items=items, missing=missing)
+
+# Export operations
+@router.get("/export", response_class=StreamingResponse, operation_id="export_items")
+def export_items(format: Literal["ndjson", "csv"] = "ndjson"):
+    """Export the whole items table.
+    
+    Streams every item in ID order as NDJSON (one JSON object per line) or CSV.
+    Rows are read in ID-keyed chunks and written as they arrive, so memory
+    use does not grow with the size of the table."""
+    return StreamingResponse(
+        EXPORT_WRITERS[format](),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
+
+@router.get("/export/sample", response_model=ExportSample, operation_id="export_items_sample")
+def export_items_sample(request: Request, limit: int = 20, format: Literal["ndjson", "csv"] = "ndjson", db: Session = Depends(get_db)):
+    """Preview an export of the items table.
+    
+    Returns the first items of the export (at most 100) and the URL to
+    download the complete table in the requested format (ndjson or csv)."""
+    items = export_sample(db, max(0, min(limit, EXPORT_SAMPLE_MAX)))
+    return ExportSample(items=items, format=format, download_url=f"{request.app.url_path_for('export_items')}?format={format}")
+
+# Import operations
+IMPORT_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "application/x-ndjson": {"schema": {"type": "string", "description": "One ItemCreate JSON object per line"}},
+        "text/csv": {"schema": {"type": "string", "description": "Header row with title, description, is_active"}},
+    },
+}
+
+@router.post("/import", response_model=ImportSummary, operation_id="import_items", openapi_extra={"requestBody": IMPORT_REQUEST_BODY})
+async def import_items_stream(request: Request, format: Literal["ndjson", "csv"] = "ndjson", import_id: Optional[str] = Query(None, max_length=64)):
+    """Import items from an NDJSON or CSV upload.
+    
+    The request body is read incrementally; each row is validated as it arrives
+    and rows are committed in fixed-size chunks.
+    Returns row counts, the line numbers that failed, and the throughput.
+    To resume an interrupted import, send the same body again with the returned
+    import_id: lines up to the last committed chunk are skipped."""
+    return await import_items(request.stream(), format, import_id)
+
+@router.get("/import/{import_id}", response_model=ImportProgress, operation_id="get_import_progress")
+def get_import_progress(import_id: str, db: Session = Depends(get_db)):
+    """Get the progress of an import.
+    
+    Returns the last committed line and the imported/failed row counts.
+    Returns 404 if the import is not found."""
+    job = db.get(models.ItemImport, import_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
 # Single item operations after
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED, operation_id="create_item")
 def create_item(item_data: ItemCreate, db: Session = Depends(get_db)):
@@ -85,31 +155,153 @@ def create_item(item_data: ItemCreate, db: Session = Depends(get_db)):
     Returns the created item with its generated ID and creation timestamp."""
     db_item = models.Item(**item_data.dict())
     db.add(db_item)
+    active = 1 if db_item.is_active else 0
+    record_created(db, active, 1 - active)
+    db.flush()
+    stamp_changes(db, [db_item.id])
     db.commit()
     db.refresh(db_item)
     return db_item
 
 @router.get("/", response_model=List[ItemResponse], operation_id="read_items")
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_items(request: Request, response: Response, skip: int = 0, limit: int = Query(100, ge=1), cursor: Optional[str] = None, sort: SortKey = "id", filters: ItemFilter = Depends(), db: Session = Depends(get_db)):
     """List all items with pagination.
     
     Retrieves a list of items from the database.
     Use skip and limit parameters to implement pagination:
     - skip: Number of items to skip (default: 0)
-    - limit: Maximum number of items to return (default: 100)"""
-    items = db.query(models.Item).offset(skip).limit(limit).all()
+    - limit: Maximum number of items to return (default: 100)
+    - cursor: Opaque cursor from a previous page; when given, skip is ignored
+    and items are returned starting after the cursor.
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    Filter with is_active, created_after/created_before, updated_after/updated_before
+    (after is inclusive, before exclusive) and title_prefix; order with sort
+    (id, created_at, updated_at or title, prefixed with - for descending; default id).
+    Responses carry an ETag that changes whenever any item is written;
+    send it back in If-None-Match to get 304 Not Modified if nothing changed."""
+    etag = version_etag(current_version(db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # With FAST_JSON, rows of plain columns are encoded directly
+    columns = ITEM_COLUMNS if FAST_JSON else None
+    if cursor is None and skip:
+        stmt = sorted_items(filters, sort, columns).offset(skip).limit(limit)
+        if FAST_JSON:
+            return Response(items_json(db.execute(stmt)), media_type="application/json", headers=dict(response.headers))
+        items = db.scalars(stmt).all()
+        return items
+    
+    try:
+        items, next_cursor = keyset_page(db, cursor, limit, filters, sort, columns)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if FAST_JSON:
+        return Response(items_json(items), media_type="application/json", headers=dict(response.headers))
     return items
 
+@router.get("/page", response_model=ItemPage, operation_id="read_items_page")
+def read_items_page(request: Request, response: Response, limit: int = Query(100, ge=1), cursor: Optional[str] = None, sort: SortKey = "id", filters: ItemFilter = Depends(), db: Session = Depends(get_db)):
+    """List items one page at a time using a cursor.
+    
+    Returns up to `limit` items in `sort` order (ID by default) and a `next_cursor`.
+    Pass `next_cursor` back as `cursor`, with the same filters and sort,
+    to fetch the following page; it is null once the last page has been reached.
+    Takes the same filters and sort keys as the item listing.
+    Every page is equally fast, however deep into the table it is.
+    Supports ETag / If-None-Match like the item listing."""
+    etag = version_etag(current_version(db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    try:
+        items, next_cursor = keyset_page(db, cursor, limit, filters, sort, ITEM_COLUMNS if FAST_JSON else None)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if FAST_JSON:
+        return Response(item_page_json(items, next_cursor), media_type="application/json", headers=dict(response.headers))
+    return ItemPage(items=items, next_cursor=next_cursor)
+
+@router.get("/changes", response_model=ItemChanges, operation_id="read_item_changes")
+def read_item_changes(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    """Get the items created, updated or deleted since a change sequence.
+    
+    Every write gives the items it touches a new change_seq. Without since, all items
+    are returned, deleted ones included; afterwards pass next_since back as since
+    to get only what changed after it. Deleted items come back once as tombstones
+    with deleted_at set. Keep fetching while has_more is true; a page may exceed
+    limit so that it never ends in the middle of a write.
+    Supports ETag / If-None-Match like the item listing."""
+    etag = version_etag(current_version(db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    changes, next_since, has_more = changes_since(db, since, limit)
+    return ItemChanges(changes=changes, next_since=next_since, has_more=has_more)
+
+@router.get("/stats", response_model=ItemStats, operation_id="get_item_stats")
+def get_item_stats(request: Request, response: Response, days: int = Query(30, ge=1, le=366), db: Session = Depends(get_db)):
+    """Get item counts.
+    
+    Returns the total number of items, how many are active and inactive,
+    and the number of items created on each of the latest `days` days that have any
+    (most recent first; deleted items are not counted).
+    Counts are maintained by every write, so this is fast whatever the size of the table.
+    Supports ETag / If-None-Match like the item listing."""
+    etag = version_etag(current_version(db))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return item_stats(db, days)
+
+@router.get("/search", response_model=SearchResults, operation_id="search_items")
+def search_items(
+    q: str,
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Full-text search over item titles and descriptions.
+    
+    Every word of q must occur in the title or description; the last word also matches as a prefix.
+    Hits are ranked by relevance (title matches weigh more) and include the score
+    and HTML snippets with the matching words wrapped in <mark>.
+    Pass next_offset back as offset to get the next page; it is null on the last page."""
+    try:
+        hits, next_offset = run_search(db, q, limit, offset)
+    except InvalidQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SearchResults(hits=hits, next_offset=next_offset)
+
 @router.get("/{item_id}", response_model=ItemResponse, operation_id="read_item")
-def read_item(item_id: int, db: Session = Depends(get_db)):
+def read_item(request: Request, item_id: int, db: Session = Depends(get_db)):
     """Get a specific item by ID.
     
     Retrieves a single item from the database using its ID.
-    Returns 404 if the item is not found."""
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return db_item
+    Returns 404 if the item is not found.
+    Returns 304 Not Modified if If-None-Match carries the item's current ETag."""
+    body = item_cache.get(item_key(item_id))
+    if body is None:
+        db_item = db.query(models.Item).filter(models.Item.id == item_id, models.Item.deleted_at.is_(None)).first()
+        if db_item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        body = ItemResponse.model_validate(db_item).model_dump_json().encode()
+        item_cache.add(item_key(item_id), body)
+    
+    etag = body_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 @router.put("/{item_id}", response_model=ItemResponse, operation_id="update_item")
 def update_item(item_id: int, item_data: ItemUpdate, db: Session = Depends(get_db)):
@@ -118,15 +310,21 @@ def update_item(item_id: int, item_data: ItemUpdate, db: Session = Depends(get_d
     Updates an item's attributes (title, description, is_active).
     Only provided fields will be updated (partial update).
     Returns 404 if the item is not found."""
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    db_item = db.query(models.Item).filter(models.Item.id == item_id, models.Item.deleted_at.is_(None)).first()
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
+    was_active = db_item.is_active
     update_data = item_data.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_item, key, value)
+    db_item.version = models.Item.version + 1
+    if bool(db_item.is_active) != bool(was_active):
+        record_toggled(db, [(db_item.created_at, db_item.is_active)])
+    stamp_changes(db, [item_id])
     
     db.commit()
+    invalidate_items([item_id])
     db.refresh(db_item)
     return db_item
 
@@ -134,13 +332,16 @@ def update_item(item_id: int, item_data: ItemUpdate, db: Session = Depends(get_d
 def delete_item(item_id: int, db: Session = Depends(get_db)):
     """Delete a specific item by ID.
     
-    Removes an item from the database permanently.
+    Removes an item; it is kept as a tombstone in the changes feed.
     Returns 204 (no content) on success.
     Returns 404 if the item is not found."""
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    db_item = db.query(models.Item).filter(models.Item.id == item_id, models.Item.deleted_at.is_(None)).first()
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
-    db.delete(db_item)
+    db_item.deleted_at = func.now()
+    record_deleted(db, [(db_item.created_at, db_item.is_active)])
+    stamp_changes(db, [item_id])
     db.commit()
+    invalidate_items([item_id])
     return None
\ No newline at end of file
@@ -0,0 +1,146 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.core.bulk import stamp_changes
+from app.core.cache import item_cache, item_key
+from app.core.database import get_async_db
+from app.core.serialization import FAST_JSON, ITEM_COLUMNS, items_json
+from app.core.stats import record_created, record_deleted, record_toggled
+from app.core.pagination import InvalidCursor, SortKey, keyset_page, sorted_items
+from app.core.versioning import body_etag, current_version, etag_matches, version_etag
+from app.models import models
+from app.schemas.item import ItemCreate, ItemFilter, ItemUpdate, ItemResponse
+
+# Async versions of the single item operations and the listing, used when
+# DB_ASYNC is enabled. Each route has the same path and operation_id as its
+# sync counterpart in app.routers.items, which it replaces.
+router = APIRouter(tags=["items"], prefix="/items")
+
+@router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED, operation_id="create_item")
+async def create_item(item_data: ItemCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a single item.
+    
+    Creates a new item in the database with the provided title and optional description.
+    Returns the created item with its generated ID and creation timestamp."""
+    db_item = models.Item(**item_data.dict())
+    db.add(db_item)
+    active = 1 if db_item.is_active else 0
+    await db.run_sync(record_created, active, 1 - active)
+    await db.flush()
+    await db.run_sync(stamp_changes, [db_item.id])
+    await db.commit()
+    await db.refresh(db_item)
+    return db_item
+
+@router.get("/", response_model=List[ItemResponse], operation_id="read_items")
+async def read_items(request: Request, response: Response, skip: int = 0, limit: int = Query(100, ge=1), cursor: Optional[str] = None, sort: SortKey = "id", filters: ItemFilter = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """List all items with pagination.
+    
+    Retrieves a list of items from the database.
+    Use skip and limit parameters to implement pagination:
+    - skip: Number of items to skip (default: 0)
+    - limit: Maximum number of items to return (default: 100)
+    - cursor: Opaque cursor from a previous page; when given, skip is ignored
+    and items are returned starting after the cursor.
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    Filter with is_active, created_after/created_before, updated_after/updated_before
+    (after is inclusive, before exclusive) and title_prefix; order with sort
+    (id, created_at, updated_at or title, prefixed with - for descending; default id).
+    Responses carry an ETag that changes whenever any item is written;
+    send it back in If-None-Match to get 304 Not Modified if nothing changed."""
+    etag = version_etag(await db.run_sync(current_version))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    # With FAST_JSON, rows of plain columns are encoded directly
+    columns = ITEM_COLUMNS if FAST_JSON else None
+    if cursor is None and skip:
+        stmt = sorted_items(filters, sort, columns).offset(skip).limit(limit)
+        if FAST_JSON:
+            return Response(items_json(await db.execute(stmt)), media_type="application/json", headers=dict(response.headers))
+        items = await db.scalars(stmt)
+        return items.all()
+    
+    try:
+        items, next_cursor = await db.run_sync(keyset_page, cursor, limit, filters, sort, columns)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if FAST_JSON:
+        return Response(items_json(items), media_type="application/json", headers=dict(response.headers))
+    return items
+
+@router.get("/{item_id}", response_model=ItemResponse, operation_id="read_item")
+async def read_item(request: Request, item_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific item by ID.
+    
+    Retrieves a single item from the database using its ID.
+    Returns 404 if the item is not found.
+    Returns 304 Not Modified if If-None-Match carries the item's current ETag."""
+    body = await item_cache.aget(item_key(item_id))
+    if body is None:
+        db_item = await db.get(models.Item, item_id)
+        if db_item is None or db_item.deleted_at is not None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        body = ItemResponse.model_validate(db_item).model_dump_json().encode()
+        await item_cache.aadd(item_key(item_id), body)
+    
+    etag = body_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+@router.put("/{item_id}", response_model=ItemResponse, operation_id="update_item")
+async def update_item(item_id: int, item_data: ItemUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update an existing item.
+    
+    Updates an item's attributes (title, description, is_active).
+    Only provided fields will be updated (partial update).
+    Returns 404 if the item is not found."""
+    db_item = await db.get(models.Item, item_id)
+    if db_item is None or db_item.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    was_active = db_item.is_active
+    update_data = item_data.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_item, key, value)
+    db_item.version = models.Item.version + 1
+    if bool(db_item.is_active) != bool(was_active):
+        await db.run_sync(record_toggled, [(db_item.created_at, db_item.is_active)])
+    await db.run_sync(stamp_changes, [item_id])
+    
+    await db.commit()
+    await item_cache.adelete([item_key(item_id)])
+    await db.refresh(db_item)
+    return db_item
+
+@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT, operation_id="delete_item")
+async def delete_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a specific item by ID.
+    
+    Removes an item; it is kept as a tombstone in the changes feed.
+    Returns 204 (no content) on success.
+    Returns 404 if the item is not found."""
+    db_item = await db.get(models.Item, item_id)
+    if db_item is None or db_item.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    db_item.deleted_at = func.now()
+    await db.run_sync(record_deleted, [(db_item.created_at, db_item.is_active)])
+    await db.run_sync(stamp_changes, [item_id])
+    await db.commit()
+    await item_cache.adelete([item_key(item_id)])
+    return None
+
+def replace_routes(sync_router: APIRouter) -> None:
+    """Swap the routes of `sync_router` for the async ones with the same operation_id.
+    
+    Routes are replaced in place so path matching order is unchanged
+    (e.g. /items/page must still be tried before /items/{item_id})."""
+    async_routes = {route.operation_id: route for route in router.routes}
+    sync_router.routes = [async_routes.get(getattr(route, "operation_id", None), route) for route in sync_router.routes]
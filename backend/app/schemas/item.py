@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Literal
 
 class ItemBase(BaseModel):
     title: str
@@ -20,14 +20,116 @@ class ItemUpdate(ItemBase):
     title: Optional[str] = None
     is_active: Optional[bool] = None
 
+class ItemBatchUpdateEntry(ItemUpdate):
+    id: int
+    # Apply the update only if the item is still at this version
+    version: Optional[int] = None
+
+class ItemBatchUpdate(BaseModel):
+    items: List[ItemBatchUpdateEntry]
+
+ItemField = Literal["id", "title", "description", "is_active", "created_at", "updated_at", "version"]
+
+class ItemBatchGet(BaseModel):
+    item_ids: List[int]
+    # Only return these fields; all fields when omitted
+    fields: Optional[List[ItemField]] = None
+
+class ItemFilter(BaseModel):
+    is_active: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    title_prefix: Optional[str] = None
+
 class ItemResponse(ItemBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int
 
     class Config:
         from_attributes = True
 
+class ItemPage(BaseModel):
+    items: List[ItemResponse]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class ItemProjection(BaseModel):
+    # ItemResponse with every field optional; unrequested fields are left out
+    id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+class ItemBatchGetResponse(BaseModel):
+    items: List[ItemProjection]
+    missing: List[int]
+
+class ItemChange(ItemResponse):
+    change_seq: int
+    # Set on deleted items (tombstones)
+    deleted_at: Optional[datetime] = None
+
+class ItemChanges(BaseModel):
+    changes: List[ItemChange]
+    next_since: int
+    has_more: bool
+
+class SearchHit(ItemResponse):
+    score: float
+    title_snippet: Optional[str] = None
+    description_snippet: Optional[str] = None
+
+class SearchResults(BaseModel):
+    hits: List[SearchHit]
+    next_offset: Optional[int] = None
+
+class DailyCount(BaseModel):
+    day: date
+    count: int
+
+class ItemStats(BaseModel):
+    total: int
+    active: int
+    inactive: int
+    created_per_day: List[DailyCount]
+
+class ExportSample(BaseModel):
+    items: List[ItemResponse]
+    format: str
+    download_url: str
+
+class ImportProgress(BaseModel):
+    id: str
+    format: str
+    committed_line: int
+    imported: int
+    failed: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ImportSummary(BaseModel):
+    import_id: str
+    received: int
+    imported: int
+    failed_count: int
+    failed: List[dict]
+    skipped: int
+    committed_line: int
+    elapsed_seconds: float
+    rows_per_second: float
+
 class BatchResponse(BaseModel):
     success: List[ItemResponse]
     failed: List[dict]
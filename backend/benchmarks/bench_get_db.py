@@ -0,0 +1,52 @@
+"""Micro-benchmark of the per-request cost of the SQLite get_db dependency.
+
+Compares the previous dependency, which ran Base.metadata.create_all on
+every request, with the current one, which creates the schema once per
+connection. Each iteration resolves the dependency and runs a primary key
+lookup, like read_item does.
+
+    python -m benchmarks.bench_get_db
+"""
+import argparse
+import logging
+import time
+
+logging.disable(logging.INFO)
+
+from app.core.database import db_components
+from app.models import models
+
+def previous_get_db(components):
+    """get_db as it was: create_all before every request."""
+    SessionLocal, Base, engine = components['SessionLocal'], components['Base'], components['engine']
+    def get_db():
+        db = SessionLocal()
+        try:
+            Base.metadata.create_all(bind=engine)
+            yield db
+        finally:
+            db.close()
+    return get_db
+
+def per_request(get_db, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dependency = get_db()
+        db = next(dependency)
+        db.get(models.Item, 1)
+        dependency.close()
+    return (time.perf_counter() - start) / iterations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    # The development (SQLite) components the application runs with
+    models.Base.metadata.create_all(bind=db_components['engine'])
+
+    before = per_request(previous_get_db(db_components), args.iterations)
+    after = per_request(db_components['get_db'], args.iterations)
+    print(f"create_all per request: {before * 1e6:8.1f} us/request")
+    print(f"schema once:            {after * 1e6:8.1f} us/request")
+    print(f"overhead removed:       {(before - after) * 1e6:8.1f} us/request ({before / after:.1f}x)")
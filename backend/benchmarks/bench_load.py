@@ -0,0 +1,110 @@
+"""Load benchmark: sync handlers (threadpool) vs async handlers (DB_ASYNC=1).
+
+Starts the API once per mode in a uvicorn subprocess against SQLite in a
+temporary file (async mode needs one), seeds it with items, then keeps
+`--concurrency` requests in flight for `--duration` seconds per scenario
+and prints requests/sec and p50/p99 latency.
+
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --concurrency 200 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+SCENARIOS = {
+    "read_item": lambda ids: ("GET", f"/api/items/{random.choice(ids)}", None),
+    "read_items": lambda ids: ("GET", "/api/items/", None),
+    "create_item": lambda ids: ("POST", "/api/items/", {"title": "Load test item", "is_active": True}),
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def start_server(port, env):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "ENVIRONMENT": "development", **env},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("API server did not start")
+
+async def run_scenario(base_url, make_request, ids, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, body = make_request(ids)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400
+            except httpx.TransportError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+def bench_mode(name, env, args):
+    port = free_port()
+    tmpdir = tempfile.TemporaryDirectory()
+    server = start_server(port, {**env, "SQLITE_PATH": os.path.join(tmpdir.name, "bench.db")})
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        seed = {"items": [{"title": f"Seed item {i}", "is_active": True} for i in range(args.items)]}
+        response = httpx.post(f"{base_url}/api/items/batch", json=seed, timeout=60)
+        ids = [item["id"] for item in response.json()["success"]]
+        for scenario in args.scenarios.split(","):
+            result = asyncio.run(run_scenario(base_url, SCENARIOS[scenario], ids, args.concurrency, args.duration))
+            print(f"{name:>6} {scenario:>12} {result['rps']:>10.0f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>7}")
+    finally:
+        server.terminate()
+        server.wait()
+        tmpdir.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per scenario")
+    parser.add_argument("--items", type=int, default=1000, help="Items seeded before the run")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'scenario':>12} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    bench_mode("sync", {"DB_ASYNC": "0"}, args)
+    bench_mode("async", {"DB_ASYNC": "1"}, args)
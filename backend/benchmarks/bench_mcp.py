@@ -0,0 +1,82 @@
+"""Benchmark of agent-style MCP tool call sequences.
+
+An agent that needs N items either calls read_item N times or calls
+read_items_batch once, optionally with only the fields it needs. Each
+sequence runs through the MCP server's call_tool handler in-process, as a
+tool call from a connected client would, and reports the wall time, the
+number of tool calls and the characters of tool results handed back to the
+agent (a proxy for context tokens).
+
+    python -m benchmarks.bench_mcp
+    python -m benchmarks.bench_mcp --items 500 --rounds 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("ENVIRONMENT", "development")
+logging.disable(logging.ERROR)  # call_tool logs an error when there is no HTTP request to forward
+
+from mcp import types
+
+from app.core.bulk import bulk_insert_items
+from app.core.database import SessionLocal
+from app.core.mcp_tools import TRUNCATED_NOTE
+from app.main import app, mcp
+
+async def call_tool(name, arguments):
+    handler = mcp.server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments))
+    result = (await handler(request)).root
+    if result.isError:
+        raise RuntimeError(result.content[0].text)
+    return result.content[0].text
+
+async def one_by_one(ids):
+    return [await call_tool("read_item", {"item_id": item_id}) for item_id in ids]
+
+async def batch(ids):
+    return [await call_tool("read_items_batch", {"item_ids": ids})]
+
+async def batch_projected(ids):
+    return [await call_tool("read_items_batch", {"item_ids": ids, "fields": ["id", "title"]})]
+
+async def list_then_read(ids):
+    # Page through the listing, then read the items it returned one by one
+    listing = await call_tool("read_items", {"limit": len(ids)})
+    return [listing] + await one_by_one(ids)
+
+SEQUENCES = {
+    "read_item x N": one_by_one,
+    "read_items_batch": batch,
+    "read_items_batch id,title": batch_projected,
+    "read_items + read_item x N": list_then_read,
+}
+
+async def main(count, rounds):
+    async with app.router.lifespan_context(app):
+        with SessionLocal() as db:
+            rows = [{"title": f"Agent item {i}", "description": "benchmark " * 20, "is_active": True} for i in range(count)]
+            ids = [item["id"] for item in bulk_insert_items(db, rows)[0]]
+            db.commit()
+
+        print(f"{count} items, best of {rounds} rounds")
+        print(f"{'sequence':>28} {'calls':>6} {'ms':>9} {'result chars':>13} {'truncated':>10}")
+        for name, sequence in SEQUENCES.items():
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                results = await sequence(ids)
+                timings.append(time.perf_counter() - start)
+            chars = sum(map(len, results))
+            truncated = sum(TRUNCATED_NOTE[:12] in result for result in results)
+            print(f"{name:>28} {len(results):>6} {min(timings) * 1000:>9.1f} {chars:>13} {truncated:>10}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agent-style MCP tool call sequences")
+    parser.add_argument("--items", type=int, default=200, help="Items the agent reads")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.rounds))
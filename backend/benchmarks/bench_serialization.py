@@ -0,0 +1,82 @@
+"""Benchmark item listing serialization: response_model vs the FAST_JSON path.
+
+Fetches pages of items from an in-memory SQLite database and encodes them
+to JSON three ways, printing items/sec for each page size:
+
+- model:    ORM objects validated into ItemResponse (from_attributes), dumped
+            and encoded with json.dumps, as FastAPI does for response_model
+- orjson:   row tuples of the needed columns encoded with orjson
+- pydantic: the same row tuples encoded by a prebuilt TypeAdapter
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --items 5000 --sizes 100,1000
+"""
+import argparse
+import json
+import logging
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+logging.disable(logging.INFO)
+
+from app.core import serialization
+from app.core.bulk import bulk_insert_items
+from app.core.pagination import keyset_page
+from app.models import models
+from app.schemas.item import ItemResponse
+
+RESPONSE_MODEL = TypeAdapter(List[ItemResponse])
+
+def model_path(db, limit):
+    items, _ = keyset_page(db, None, limit)
+    content = RESPONSE_MODEL.dump_python(RESPONSE_MODEL.validate_python(items, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+def row_path(db, limit):
+    rows, _ = keyset_page(db, None, limit, columns=serialization.ITEM_COLUMNS)
+    return serialization.items_json(rows)
+
+def pydantic_row_path(db, limit):
+    orjson, serialization.orjson = serialization.orjson, None
+    try:
+        return row_path(db, limit)
+    finally:
+        serialization.orjson = orjson
+
+PATHS = {"model": model_path, "orjson": row_path, "pydantic": pydantic_row_path}
+
+def run(items, sizes, repeat):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        bulk_insert_items(db, [{"title": f"Bench item {i}", "description": "benchmark " * 10, "is_active": True} for i in range(items)])
+        db.commit()
+
+    paths = {name: fn for name, fn in PATHS.items() if name != "orjson" or serialization.orjson is not None}
+    print(f"{'page':>6} " + " ".join(f"{name + ' items/s':>18}" for name in paths) + f" {'speedup':>8}")
+    for size in sizes:
+        rates = {}
+        for name, fn in paths.items():
+            best = float("inf")
+            for _ in range(repeat):
+                with SessionLocal() as db:
+                    start = time.perf_counter()
+                    fn(db, size)
+                    best = min(best, time.perf_counter() - start)
+            rates[name] = size / best
+        fastest = max(rate for name, rate in rates.items() if name != "model")
+        print(f"{size:>6} " + " ".join(f"{rates[name]:>18.0f}" for name in paths) + f" {fastest / rates['model']:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000, help="Items in the database")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page size; the best is reported")
+    args = parser.parse_args()
+    run(args.items, [int(size) for size in args.sizes.split(",")], args.repeat)
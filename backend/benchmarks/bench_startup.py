@@ -0,0 +1,69 @@
+"""Benchmark of startup time and first-request latency, with and without warm-up.
+
+Starts the API in a fresh uvicorn process several times and measures the
+time until it answers, then the latency of the first requests to the hot
+endpoints against their steady-state latency. STARTUP_WARMUP=0 skips
+opening the pool and compiling statements at startup.
+
+    python -m benchmarks.bench_startup
+    SQLITE_PATH=/tmp/bench.db python -m benchmarks.bench_startup --starts 10
+"""
+import argparse
+import statistics
+import time
+
+import httpx
+
+from benchmarks.bench_load import free_port, start_server
+
+PATHS = ["/api/items/", "/api/items/page?limit=10", "/api/items/1", "/api/items/stats"]
+
+def first_requests(port, repeats):
+    """Latency of the first request to each path, and its median over `repeats` more."""
+    first = {}
+    steady = {}
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+        for path in PATHS:
+            start = time.perf_counter()
+            client.get(path)
+            first[path] = time.perf_counter() - start
+        for path in PATHS:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                client.get(path)
+                timings.append(time.perf_counter() - start)
+            steady[path] = statistics.median(timings)
+    return first, steady
+
+def measure(warmup, starts, repeats):
+    ready = []
+    first = {path: [] for path in PATHS}
+    steady = {path: [] for path in PATHS}
+    for _ in range(starts):
+        port = free_port()
+        start = time.perf_counter()
+        server = start_server(port, {"STARTUP_WARMUP": "1" if warmup else "0"})
+        ready.append(time.perf_counter() - start)
+        try:
+            run_first, run_steady = first_requests(port, repeats)
+        finally:
+            server.terminate()
+            server.wait()
+        for path in PATHS:
+            first[path].append(run_first[path])
+            steady[path].append(run_steady[path])
+    return statistics.median(ready), {path: statistics.median(v) for path, v in first.items()}, {path: statistics.median(v) for path, v in steady.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup time and first-request latency")
+    parser.add_argument("--starts", type=int, default=5, help="Server starts per configuration")
+    parser.add_argument("--repeats", type=int, default=20, help="Requests per path for the steady-state latency")
+    args = parser.parse_args()
+
+    for warmup in (False, True):
+        ready, first, steady = measure(warmup, args.starts, args.repeats)
+        print(f"STARTUP_WARMUP={int(warmup)}: ready after {ready * 1000:.0f} ms (median of {args.starts} starts)")
+        print(f"{'path':>28} {'first ms':>9} {'steady ms':>10}")
+        for path in PATHS:
+            print(f"{path:>28} {first[path] * 1000:>9.2f} {steady[path] * 1000:>10.2f}")
@@ -1,7 +1,9 @@
+import importlib.util
 import time
 import os
+import random
+import sys
 import logging
-import subprocess
 import pymysql
 
 # Configure logging
@@ -11,47 +13,137 @@ logging.basicConfig(
 )
 logger = logging.getLogger("startup")
 
+PRODUCTION = os.environ.get("ENVIRONMENT") == "production"
+
 # Database connection parameters
 DB_HOST = os.environ.get("DB_HOST")
-DB_PORT = int(os.environ.get("DB_PORT"))
+DB_PORT = int(os.environ.get("DB_PORT", "3306"))
 DB_USER = os.environ.get("DB_USER")
 DB_PASSWORD = os.environ.get("DB_PASSWORD")
 DB_NAME = os.environ.get("DB_NAME")
 
-MAX_RETRIES = 60
-RETRY_INTERVAL = 2
+# Readiness check: retry with exponential backoff (and jitter) up to DB_WAIT_TIMEOUT seconds
+DB_WAIT_TIMEOUT = float(os.environ.get("DB_WAIT_TIMEOUT", "120"))
+DB_WAIT_INITIAL_DELAY = float(os.environ.get("DB_WAIT_INITIAL_DELAY", "0.25"))
+DB_WAIT_MAX_DELAY = float(os.environ.get("DB_WAIT_MAX_DELAY", "8"))
+
+# Server: production runs WEB_CONCURRENCY worker processes; development
+# (SERVER_MODE=development) a single process reloading on code changes
+SERVER_MODE = os.environ.get("SERVER_MODE", "production" if PRODUCTION else "development")
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = os.environ.get("PORT", "8000")
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+# Seconds uvicorn waits for running requests when stopping
+GRACEFUL_TIMEOUT = os.environ.get("GRACEFUL_TIMEOUT", "10")
+# Connections left free for other clients (migrations, admin, monitoring)
+DB_RESERVED_CONNECTIONS = int(os.environ.get("DB_RESERVED_CONNECTIONS", "10"))
+# Item cache backend (see app.core.cache); "memory" is private to each worker
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
 
 def wait_for_database():
-    """Wait for the database to become available."""
+    """Wait for the database to become available.
+
+    Returns an open connection, or None if it did not answer within DB_WAIT_TIMEOUT."""
     logger.info(f"Waiting for database at {DB_HOST}:{DB_PORT}...")
-    
-    for attempt in range(MAX_RETRIES):
+
+    deadline = time.monotonic() + DB_WAIT_TIMEOUT
+    delay = DB_WAIT_INITIAL_DELAY
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             connection = pymysql.connect(
                 host=DB_HOST,
                 port=DB_PORT,
                 user=DB_USER,
                 password=DB_PASSWORD,
+                connect_timeout=5,
             )
-            connection.close()
-            logger.info("Database connection established successfully!")
-            return True
+            logger.info(f"Database connection established after {attempt} attempts")
+            return connection
         except Exception as e:
-            logger.warning(f"Database connection attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
-            if attempt < MAX_RETRIES - 1:
-                logger.info(f"Retrying in {RETRY_INTERVAL} seconds...")
-                time.sleep(RETRY_INTERVAL)
-            else:
-                logger.error("Maximum number of retries reached. Giving up.")
-                return False
-    return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(f"Database not available after {DB_WAIT_TIMEOUT:.0f} seconds: {e}")
+                return None
+            sleep = min(delay * random.uniform(0.5, 1.0), remaining)
+            logger.warning(f"Database connection attempt {attempt} failed: {e}; retrying in {sleep:.2f} seconds")
+            time.sleep(sleep)
+            delay = min(delay * 2, DB_WAIT_MAX_DELAY)
+
+def size_pools(connection, workers):
+    """Set DB_POOL_SIZE / DB_MAX_OVERFLOW for the workers so that all their pools
+    together stay under the server's max_connections."""
+    # Imported here: app.core.pool reads the DB_POOL_* variables only when called
+    from app.core.pool import pool_limits, pool_options
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT @@max_connections")
+        max_connections = int(cursor.fetchone()[0])
+    budget = max_connections - DB_RESERVED_CONNECTIONS
+    # Each worker has a sync engine, plus an async one with DB_ASYNC
+    engines = 2 if os.environ.get("DB_ASYNC", "false").lower() in ("1", "true", "yes") else 1
+    options = pool_options()
+    pool_size, max_overflow = pool_limits(budget, workers, engines, options["pool_size"], options["max_overflow"])
+    if (pool_size, max_overflow) != (options["pool_size"], options["max_overflow"]):
+        logger.warning(
+            f"DB_POOL_SIZE={options['pool_size']} and DB_MAX_OVERFLOW={options['max_overflow']} would open more than "
+            f"{budget} connections (max_connections {max_connections} - {DB_RESERVED_CONNECTIONS} reserved) "
+            f"across {workers} workers; using {pool_size} and {max_overflow}"
+        )
+    if workers * engines > budget:
+        logger.warning(f"{workers} workers need at least {workers * engines} connections, more than the {budget} available")
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    logger.info(f"Per-worker pool: pool_size={pool_size}, max_overflow={max_overflow} ({engines} engine(s) x {workers} workers)")
+
+def prepare_schema():
+    """Create the schema once before the workers start, so they do not race to create it."""
+    from app.main import create_schema, engine
+
+    create_schema()
+    engine.dispose()
+
+def uvicorn_command(workers):
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", PORT]
+    if SERVER_MODE == "development":
+        return command + ["--reload"]
+
+    command += ["--workers", str(workers), "--timeout-graceful-shutdown", GRACEFUL_TIMEOUT, "--proxy-headers"]
+    # Faster event loop and HTTP parser when installed
+    if importlib.util.find_spec("uvloop") is not None:
+        command += ["--loop", "uvloop"]
+    if importlib.util.find_spec("httptools") is not None:
+        command += ["--http", "httptools"]
+    return command
 
 if __name__ == "__main__":
-    # Wait for database to be ready
-    if wait_for_database():
-        logger.info("Starting FastAPI application...")
-        # Start the FastAPI application using uvicorn
-        subprocess.run(["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"])
-    else:
-        logger.error("Failed to connect to the database. Exiting.")
-        exit(1)
\ No newline at end of file
+    workers = 1 if SERVER_MODE == "development" else WEB_CONCURRENCY
+    if workers > 1 and not PRODUCTION and not os.environ.get("SQLITE_PATH"):
+        # Every process would get its own in-memory database
+        logger.warning("In-memory SQLite cannot be shared between workers; starting 1 worker (set SQLITE_PATH)")
+        workers = 1
+    if workers > 1 and CACHE_BACKEND == "memory":
+        # A write only invalidates the cache of the worker that handled it;
+        # the others would serve the old item until CACHE_TTL_SECONDS
+        logger.warning(f"CACHE_BACKEND=memory is per process and would serve stale items with {workers} workers; "
+                       "disabling the item cache (set CACHE_BACKEND=redis)")
+        os.environ["CACHE_BACKEND"] = "none"
+    if PRODUCTION:
+        # Wait for database to be ready
+        connection = wait_for_database()
+        if connection is None:
+            logger.error("Failed to connect to the database. Exiting.")
+            exit(1)
+        try:
+            size_pools(connection, workers)
+        finally:
+            connection.close()
+
+    if workers > 1:
+        prepare_schema()
+
+    command = uvicorn_command(workers)
+    logger.info(f"Starting FastAPI application ({SERVER_MODE}): {' '.join(command[1:])}")
+    # Replace this process, so uvicorn receives the container's signals directly
+    os.execv(command[0], command)
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from app.core import bulk
+from app.core.bulk import bulk_insert_items, bulk_update_items
+from app.core.versioning import ensure_version
+from app.models import models
+
+# Runs the bulk insert against an SQLite database created from the models,
+# with INSERT ... RETURNING turned off to take the path used on MySQL, so it
+# needs no running server
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    engine.dialect.insert_returning = False
+    with Session(engine) as db:
+        ensure_version(db)
+        yield db
+
+def test_insert_without_returning(db):
+    # Ids are read per row, not derived from the first one
+    db.execute(models.Item.__table__.insert().values(id=10, title="Existing"))
+    created, failed = bulk_insert_items(db, [{"title": f"Item {i}"} for i in range(5)], chunk_size=2)
+    assert failed == []
+    stored = dict(db.execute(select(models.Item.id, models.Item.title)).all())
+    assert [stored[item["id"]] for item in created] == [f"Item {i}" for i in range(5)]
+
+def test_insert_without_returning_isolates_failed_rows(db):
+    db.execute(models.Item.__table__.insert().values(id=1, title="Existing"))
+    created, failed = bulk_insert_items(db, [{"title": "First"}, {"id": 1, "title": "Duplicate"}, {"title": "Last"}])
+    assert [item["title"] for item in created] == ["First", "Last"]
+    assert [f["index"] for f in failed] == [1]
+    # The failed chunk left no rows behind before being retried row by row
+    assert db.execute(select(models.Item.title).order_by(models.Item.id)).scalars().all() == ["Existing", "First", "Last"]
+
+def test_update_lost_to_concurrent_writer(tmp_path, monkeypatch):
+    # A file database: the SELECT of bulk_update_items locks nothing, so
+    # another connection can commit between it and the UPDATE
+    engine = create_engine(f"sqlite:///{tmp_path / 'items.db'}")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        ensure_version(db)
+        db.execute(models.Item.__table__.insert().values(id=1, title="Original"))
+        db.commit()
+
+    update_group = bulk._update_group
+    def concurrent_update_group(db, *args):
+        with engine.begin() as other:
+            other.execute(update(models.Item).where(models.Item.id == 1).values(title="Other writer", version=models.Item.version + 1))
+        return update_group(db, *args)
+    monkeypatch.setattr(bulk, "_update_group", concurrent_update_group)
+
+    with Session(engine) as db:
+        updated, failed = bulk_update_items(db, [{"id": 1, "version": 1, "title": "Ours"}])
+        db.commit()
+    assert updated == []
+    assert [f["error"] for f in failed] == ["409: Version conflict (item changed during the update)"]
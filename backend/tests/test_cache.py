@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.cache import Cache, LRUCache
+
+# In-process cache semantics, checked without a running server
+
+def test_add_does_not_overwrite():
+    cache = LRUCache("test")
+    cache.add("1", b"first")
+    cache.add("1", b"second")
+    assert cache.get("1") == b"first"
+
+def test_add_after_invalidation_is_ignored():
+    # A read-through miss that read the row before a write must not store it
+    # after the write has invalidated the key
+    cache = LRUCache("test", invalidation_ttl=60)
+    cache.set("1", b"v1")
+    stale = cache.get("1")
+    cache.delete(["1"])
+    cache.add("1", stale)
+    assert cache.get("1") is None
+
+def test_add_after_invalidation_expires():
+    cache = LRUCache("test", invalidation_ttl=0)
+    cache.delete(["1"])
+    cache.add("1", b"v2")
+    assert cache.get("1") == b"v2"
+
+def test_backend_must_implement_every_operation():
+    class NoDelete(Cache):
+        def get(self, key):
+            return None
+
+        def set(self, key, value):
+            pass
+
+        def add(self, key, value):
+            pass
+
+    with pytest.raises(TypeError):
+        NoDelete("test")
@@ -1,5 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import io
+import json
 import pytest
 import requests
+import uuid
 
 BASE_URL = "http://localhost:8000/api"
 
@@ -38,6 +43,50 @@ def test_create_and_delete_item():
     response = requests.delete(f"{BASE_URL}/items/{item_id}")
     assert response.status_code == 204
 
+def test_concurrent_requests():
+    # Single item requests (async handlers with DB_ASYNC) in flight together
+    # with batch and stats requests, which always use the sync engine
+    requests_to_send = (
+        [("POST", "/items/", {"title": "Concurrent Item", "is_active": True})] * 60
+        + [("POST", "/items/batch", {"items": [{"title": "Concurrent Batch Item", "is_active": True}] * 20})] * 30
+        + [("GET", "/items/?limit=10", None)] * 60
+        + [("GET", "/items/stats", None)] * 30
+    )
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(lambda r: requests.request(r[0], f"{BASE_URL}{r[1]}", json=r[2]), requests_to_send))
+    assert [response.status_code for response in responses] == [201] * 90 + [200] * 90
+    
+    # Clean up
+    created_ids = [response.json()["id"] for response in responses[:60]]
+    created_ids += [item["id"] for response in responses[60:90] for item in response.json()["success"]]
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": created_ids})
+    assert response.status_code == 200
+
+def test_created_items_are_not_updated():
+    # Stamping a write's change sequence must not count as an update
+    response = requests.post(f"{BASE_URL}/items/", json={"title": "Fresh Item", "is_active": True})
+    assert response.status_code == 201
+    item_ids = [response.json()["id"]]
+    response = requests.post(f"{BASE_URL}/items/batch", json={"items": [{"title": "Fresh Batch Item", "is_active": True}]})
+    assert response.status_code == 201
+    item_ids.append(response.json()["success"][0]["id"])
+    body = json.dumps({"title": "Fresh Import Item"})
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "ndjson"}, data=body)
+    assert response.json()["imported"] == 1
+    response = requests.get(f"{BASE_URL}/items/", params={"title_prefix": "Fresh Import Item"})
+    item_ids.append(response.json()[-1]["id"])
+    
+    for item_id in item_ids:
+        response = requests.get(f"{BASE_URL}/items/{item_id}")
+        assert response.status_code == 200
+        assert response.json()["updated_at"] is None
+    listed = requests.get(f"{BASE_URL}/items/", params={"updated_after": "2000-01-01T00:00:00", "limit": 1000}).json()
+    assert not set(item_ids) & {item["id"] for item in listed}
+    
+    # Clean up
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": item_ids})
+    assert response.status_code == 200
+
 def test_create_read_update_delete_flow():
     # Create an item
     item_data = {
@@ -144,3 +193,511 @@ def test_item_not_found():
     # Try to delete a non-existent item
     response = requests.delete(f"{BASE_URL}/items/99999")
     assert response.status_code == 404
+
+def test_batch_create_reports_invalid_items():
+    # An item with a title longer than the column allows must fail on its own
+    items_to_create = {
+        "items": [
+            {"title": "Valid Batch Item 1", "description": "ok", "is_active": True},
+            {"title": "x" * 101, "description": "title too long", "is_active": True},
+            {"title": "Valid Batch Item 2", "description": "ok", "is_active": True}
+        ]
+    }
+    
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    batch_result = response.json()
+    assert [item["title"] for item in batch_result["success"]] == ["Valid Batch Item 1", "Valid Batch Item 2"]
+    assert len(batch_result["failed"]) == 1
+    assert batch_result["failed"][0]["index"] == 1
+    
+    # Clean up
+    for item in batch_result["success"]:
+        response = requests.delete(f"{BASE_URL}/items/{item['id']}")
+        assert response.status_code == 204
+
+def test_batch_delete_reports_missing_ids():
+    items_to_create = {
+        "items": [
+            {"title": "Batch Delete Item 1", "is_active": True},
+            {"title": "Batch Delete Item 2", "is_active": True}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    created_ids = [item["id"] for item in response.json()["success"]]
+    
+    # A missing id in the middle must not affect the others
+    delete_data = {"item_ids": [created_ids[0], 99999, created_ids[1]]}
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json=delete_data)
+    assert response.status_code == 200
+    delete_result = response.json()
+    assert [item["id"] for item in delete_result["success"]] == created_ids
+    assert len(delete_result["failed"]) == 1
+    assert delete_result["failed"][0]["index"] == 1
+    assert delete_result["failed"][0]["item_id"] == 99999
+    
+    # The deleted items are gone
+    for item_id in created_ids:
+        response = requests.get(f"{BASE_URL}/items/{item_id}")
+        assert response.status_code == 404
+
+def test_cursor_pagination():
+    items_to_create = {"items": [{"title": f"Page Item {i}", "is_active": True} for i in range(5)]}
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    created_ids = [item["id"] for item in response.json()["success"]]
+    
+    # Walk the whole table two items at a time
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(f"{BASE_URL}/items/page", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen_ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen_ids == sorted(seen_ids)
+    assert set(created_ids) <= set(seen_ids)
+    
+    # The listing endpoint accepts the same cursor and returns the next one in a header
+    response = requests.get(f"{BASE_URL}/items/", params={"limit": 2})
+    assert response.status_code == 200
+    next_cursor = response.headers["X-Next-Cursor"]
+    response = requests.get(f"{BASE_URL}/items/", params={"limit": 2, "cursor": next_cursor})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == seen_ids[2:4]
+    
+    response = requests.get(f"{BASE_URL}/items/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    
+    # An empty page would have no next cursor, as if the listing had ended
+    for path in ("/items/page", "/items/"):
+        response = requests.get(f"{BASE_URL}{path}", params={"limit": 0})
+        assert response.status_code == 422
+    
+    # Clean up
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": created_ids})
+    assert response.status_code == 200
+
+def test_export_items():
+    items_to_create = {"items": [{"title": f"Export Item {i}", "description": "a, \"quoted\" value", "is_active": True} for i in range(3)]}
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    created_ids = [item["id"] for item in response.json()["success"]]
+    
+    # NDJSON: one object per line
+    response = requests.get(f"{BASE_URL}/items/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    exported = {row["id"]: row for row in rows}
+    for item_id in created_ids:
+        assert exported[item_id]["description"] == "a, \"quoted\" value"
+    
+    # CSV: header row plus one row per item
+    response = requests.get(f"{BASE_URL}/items/export", params={"format": "csv"})
+    assert response.status_code == 200
+    csv_rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert {int(row["id"]) for row in csv_rows} == set(exported)
+    
+    # Sample for agents: bounded rows plus a download URL
+    response = requests.get(f"{BASE_URL}/items/export/sample", params={"limit": 2})
+    assert response.status_code == 200
+    sample = response.json()
+    assert len(sample["items"]) == 2
+    assert sample["download_url"] == "/api/items/export?format=ndjson"
+    
+    # Clean up
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": created_ids})
+    assert response.status_code == 200
+
+def test_import_items():
+    body = "\n".join([
+        json.dumps({"title": "Import Item 1", "description": "first"}),
+        json.dumps({"description": "missing title"}),
+        "not json",
+        json.dumps({"title": "Import Item 2", "is_active": False}),
+    ])
+    import_id = f"test-import-{uuid.uuid4().hex}"
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "ndjson", "import_id": import_id}, data=body)
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["import_id"] == import_id
+    assert summary["received"] == 4
+    assert summary["imported"] == 2
+    assert [f["line"] for f in summary["failed"]] == [2, 3]
+    assert summary["committed_line"] == 4
+    
+    response = requests.get(f"{BASE_URL}/items/import/{import_id}")
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    
+    # Sending the same body again resumes after the committed lines
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "ndjson", "import_id": import_id}, data=body)
+    assert response.status_code == 200
+    assert response.json()["skipped"] == 4
+    assert response.json()["imported"] == 0
+    
+    # CSV as written by the export, including a quoted multi-line field
+    body = 'id,title,description,is_active\r\n,Import Item 3,"two\r\nlines",True\r\n,Import Item 4,,False\r\n'
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "csv"}, data=body)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    
+    # A line that is not valid UTF-8 fails on its own
+    body = b'{"title": "Import Item 5"}\n{"title": "Bad \xff"}\n'
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "ndjson"}, data=body)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert [f["line"] for f in response.json()["failed"]] == [2]
+    body = b'id,title,description,is_active\r\n,Bad \xff,,True\r\n,Import Item 6,,True\r\n'
+    response = requests.post(f"{BASE_URL}/items/import", params={"format": "csv"}, data=body)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert [f["line"] for f in response.json()["failed"]] == [2]
+    
+    # Clean up
+    response = requests.get(f"{BASE_URL}/items/export")
+    imported_ids = [row["id"] for row in map(json.loads, response.text.splitlines()) if row["title"].startswith("Import Item")]
+    assert len(imported_ids) == 6
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": imported_ids})
+    assert response.status_code == 200
+
+def test_metrics_endpoint():
+    response = requests.get(BASE_URL.replace("/api", "/metrics"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+
+def test_event_streams_not_in_progress():
+    # An open MCP SSE connection must not hold up the shutdown drain
+    with requests.get(BASE_URL.replace("/api", "/mcp"), stream=True, timeout=5) as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        text = requests.get(BASE_URL.replace("/api", "/metrics")).text
+    # Only the metrics request itself is in progress
+    assert "\nhttp_requests_in_progress 1\n" in text
+
+def test_request_metrics():
+    response = requests.post(f"{BASE_URL}/items/", json={"title": "Metrics Item", "is_active": True})
+    item_id = response.json()["id"]
+    requests.get(f"{BASE_URL}/items/{item_id}")
+    requests.get(f"{BASE_URL}/no-such-path-{item_id}")
+    requests.delete(f"{BASE_URL}/items/{item_id}")
+    
+    text = requests.get(BASE_URL.replace("/api", "/metrics")).text
+    # Series are labelled with the route template, never the raw path
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/items/{item_id}",status="200"}' in text
+    assert 'route="unmatched",status="404"' in text
+    assert f"no-such-path-{item_id}" not in text
+    assert 'http_request_db_queries_bucket{method="DELETE",route="/api/items/{item_id}",le="+Inf"}' in text
+    assert "db_queries_total{engine=" in text
+
+def test_read_item_cache_invalidation():
+    response = requests.post(f"{BASE_URL}/items/", json={"title": "Cached Item", "is_active": True})
+    assert response.status_code == 201
+    item_id = response.json()["id"]
+    
+    # Read twice so the second read is served from the cache
+    for _ in range(2):
+        response = requests.get(f"{BASE_URL}/items/{item_id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Cached Item"
+    
+    # Updates must not be hidden by the cache
+    response = requests.put(f"{BASE_URL}/items/{item_id}", json={"title": "Cached Item Updated"})
+    assert response.status_code == 200
+    response = requests.get(f"{BASE_URL}/items/{item_id}")
+    assert response.json()["title"] == "Cached Item Updated"
+    
+    # Neither must deletes, single or batch
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": [item_id]})
+    assert response.status_code == 200
+    response = requests.get(f"{BASE_URL}/items/{item_id}")
+    assert response.status_code == 404
+    
+    metrics = requests.get(BASE_URL.replace("/api", "/metrics")).text
+    assert 'cache_hits_total{cache="item"}' in metrics
+
+def test_conditional_get():
+    response = requests.post(f"{BASE_URL}/items/", json={"title": "ETag Item", "is_active": True})
+    assert response.status_code == 201
+    item_id = response.json()["id"]
+    
+    # Item: unchanged -> 304, changed -> 200 with a new ETag
+    response = requests.get(f"{BASE_URL}/items/{item_id}")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    response = requests.get(f"{BASE_URL}/items/{item_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = requests.put(f"{BASE_URL}/items/{item_id}", json={"description": "changed"})
+    assert response.status_code == 200
+    response = requests.get(f"{BASE_URL}/items/{item_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    
+    # Listing: any write changes the ETag
+    response = requests.get(f"{BASE_URL}/items/")
+    list_etag = response.headers["ETag"]
+    response = requests.get(f"{BASE_URL}/items/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 304
+    
+    response = requests.delete(f"{BASE_URL}/items/{item_id}")
+    assert response.status_code == 204
+    response = requests.get(f"{BASE_URL}/items/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != list_etag
+
+def test_batch_update():
+    items_to_create = {
+        "items": [
+            {"title": "Batch Update Item 1", "is_active": True},
+            {"title": "Batch Update Item 2", "is_active": True},
+            {"title": "Batch Update Item 3", "is_active": True}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    created = response.json()["success"]
+    ids = [item["id"] for item in created]
+    assert all(item["version"] == 1 for item in created)
+    
+    updates = {
+        "items": [
+            {"id": ids[0], "title": "Renamed 1", "version": 1},
+            {"id": ids[1], "title": "Renamed 2"},
+            {"id": ids[2], "is_active": False, "version": 7},  # stale version
+            {"id": 999999, "is_active": False},
+            {"id": ids[1], "title": None}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch/update", json=updates)
+    assert response.status_code == 200
+    result = response.json()
+    assert [(item["id"], item["title"], item["version"]) for item in result["success"]] == [
+        (ids[0], "Renamed 1", 2),
+        (ids[1], "Renamed 2", 2)
+    ]
+    assert [(f["index"], f["error"][:3]) for f in result["failed"]] == [(2, "409"), (3, "404"), (4, "Ite")]
+    
+    # The single item endpoints see the new values and version
+    response = requests.get(f"{BASE_URL}/items/{ids[0]}")
+    assert response.json()["title"] == "Renamed 1"
+    assert response.json()["version"] == 2
+    response = requests.get(f"{BASE_URL}/items/{ids[2]}")
+    assert response.json()["is_active"] is True
+    
+    response = requests.put(f"{BASE_URL}/items/{ids[2]}", json={"description": "changed"})
+    assert response.json()["version"] == 2
+    
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": ids})
+    assert response.status_code == 200
+
+def test_search_items():
+    marker = uuid.uuid4().hex[:8]
+    items_to_create = {
+        "items": [
+            {"title": f"Quarterly report {marker}", "description": "Revenue summary", "is_active": True},
+            {"title": "Meeting notes", "description": f"Discussed the quarterly report {marker} <draft>", "is_active": True},
+            {"title": f"Unrelated {marker}", "description": "Nothing to see", "is_active": True}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    ids = [item["id"] for item in response.json()["success"]]
+    
+    # Title matches rank first; snippets are escaped and highlighted
+    response = requests.get(f"{BASE_URL}/items/search", params={"q": f"quarterly {marker}"})
+    assert response.status_code == 200
+    hits = response.json()["hits"]
+    assert [hit["id"] for hit in hits] == ids[:2]
+    assert hits[0]["score"] >= hits[1]["score"]
+    assert f"<mark>{marker}</mark>" in hits[0]["title_snippet"]
+    assert "&lt;draft&gt;" in hits[1]["description_snippet"]
+    
+    # The last word matches as a prefix; pages follow next_offset
+    response = requests.get(f"{BASE_URL}/items/search", params={"q": marker[:5], "limit": 2})
+    page = response.json()
+    assert len(page["hits"]) == 2
+    assert page["next_offset"] == 2
+    response = requests.get(f"{BASE_URL}/items/search", params={"q": marker[:5], "limit": 2, "offset": 2})
+    assert len(response.json()["hits"]) == 1
+    assert {hit["id"] for hit in page["hits"] + response.json()["hits"]} == set(ids)
+    assert response.json()["next_offset"] is None
+    
+    # Updates and deletes are reflected in the index
+    response = requests.put(f"{BASE_URL}/items/{ids[2]}", json={"title": "Renamed"})
+    assert response.status_code == 200
+    requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": ids[:1]})
+    response = requests.get(f"{BASE_URL}/items/search", params={"q": marker})
+    assert [hit["id"] for hit in response.json()["hits"]] == [ids[1]]
+    
+    response = requests.get(f"{BASE_URL}/items/search", params={"q": "?!"})
+    assert response.status_code == 400
+    
+    requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": ids[1:]})
+
+def test_filtered_sorted_listing():
+    prefix = f"Filter {uuid.uuid4().hex[:8]}"
+    items_to_create = {
+        "items": [
+            {"title": f"{prefix} b", "is_active": True},
+            {"title": f"{prefix} a", "is_active": False},
+            {"title": f"{prefix} c", "is_active": True}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    ids = [item["id"] for item in response.json()["success"]]
+    
+    response = requests.get(f"{BASE_URL}/items/", params={"title_prefix": prefix, "sort": "-title"})
+    assert [item["title"][-1] for item in response.json()] == ["c", "b", "a"]
+    
+    response = requests.get(f"{BASE_URL}/items/", params={"title_prefix": prefix, "is_active": True, "sort": "title"})
+    assert [item["title"][-1] for item in response.json()] == ["b", "c"]
+    
+    # Cursor pages follow the sort order
+    titles = []
+    cursors = []
+    cursor = None
+    while True:
+        params = {"title_prefix": prefix, "sort": "-created_at", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        page = requests.get(f"{BASE_URL}/items/page", params=params).json()
+        titles.extend(item["title"][-1] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        cursors.append(cursor)
+    assert titles == ["c", "a", "b"]  # same created_at second: newest id first
+    
+    response = requests.get(f"{BASE_URL}/items/", params={"title_prefix": prefix, "created_after": "2000-01-01T00:00:00Z", "created_before": "2000-01-02T00:00:00Z"})
+    assert response.json() == []
+    
+    # A cursor is tied to its sort order
+    response = requests.get(f"{BASE_URL}/items/page", params={"cursor": cursors[0], "sort": "title"})
+    assert response.status_code == 400
+    
+    response = requests.get(f"{BASE_URL}/items/", params={"sort": "description"})
+    assert response.status_code == 422
+    
+    requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": ids})
+
+def test_item_stats():
+    def stats():
+        response = requests.get(f"{BASE_URL}/items/stats")
+        assert response.status_code == 200
+        return response.json()
+    
+    before = stats()
+    assert before["total"] == before["active"] + before["inactive"]
+    
+    response = requests.post(f"{BASE_URL}/items/batch", json={"items": [
+        {"title": "Stats Item 1", "is_active": True},
+        {"title": "Stats Item 2", "is_active": False}
+    ]})
+    ids = [item["id"] for item in response.json()["success"]]
+    response = requests.post(f"{BASE_URL}/items/", json={"title": "Stats Item 3", "is_active": True})
+    ids.append(response.json()["id"])
+    after = stats()
+    assert (after["total"], after["active"], after["inactive"]) == (before["total"] + 3, before["active"] + 2, before["inactive"] + 1)
+    assert after["created_per_day"][0]["count"] >= 3
+    
+    # Toggling is_active moves items between the counts
+    requests.put(f"{BASE_URL}/items/{ids[0]}", json={"is_active": False})
+    requests.post(f"{BASE_URL}/items/batch/update", json={"items": [{"id": ids[1], "is_active": True}, {"id": ids[2], "title": "Renamed"}]})
+    toggled = stats()
+    assert (toggled["active"], toggled["inactive"]) == (after["active"], after["inactive"])
+    requests.put(f"{BASE_URL}/items/{ids[1]}", json={"is_active": False})
+    toggled = stats()
+    assert (toggled["active"], toggled["inactive"]) == (after["active"] - 1, after["inactive"] + 1)
+    
+    requests.delete(f"{BASE_URL}/items/{ids[0]}")
+    requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": ids[1:]})
+    assert stats() == before
+
+def test_batch_get():
+    items_to_create = {
+        "items": [
+            {"title": "Batch Get Item 1", "description": "First"},
+            {"title": "Batch Get Item 2", "is_active": False}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/items/batch", json=items_to_create)
+    assert response.status_code == 201
+    ids = [item["id"] for item in response.json()["success"]]
+    
+    # Request order is kept, repeated ids are returned once
+    response = requests.post(f"{BASE_URL}/items/batch/get", json={"item_ids": [ids[1], 999999, ids[0], ids[1]]})
+    assert response.status_code == 200
+    result = response.json()
+    assert [item["id"] for item in result["items"]] == [ids[1], ids[0]]
+    assert result["items"][1] == requests.get(f"{BASE_URL}/items/{ids[0]}").json()
+    assert result["missing"] == [999999]
+    
+    # Only the requested fields are returned
+    response = requests.post(f"{BASE_URL}/items/batch/get", json={"item_ids": ids, "fields": ["title", "description"]})
+    assert response.json()["items"] == [
+        {"title": "Batch Get Item 1", "description": "First"},
+        {"title": "Batch Get Item 2", "description": None}
+    ]
+    
+    response = requests.post(f"{BASE_URL}/items/batch/get", json={"item_ids": ids, "fields": ["secret"]})
+    assert response.status_code == 422
+    
+    for item_id in ids:
+        requests.delete(f"{BASE_URL}/items/{item_id}")
+
+def test_item_changes():
+    response = requests.get(f"{BASE_URL}/items/changes", params={"since": 0, "limit": 1})
+    assert response.status_code == 200
+    since = response.json()["next_since"]
+    while response.json()["has_more"]:
+        response = requests.get(f"{BASE_URL}/items/changes", params={"since": since, "limit": 1000})
+        since = response.json()["next_since"]
+    
+    # Nothing changed since the last page
+    response = requests.get(f"{BASE_URL}/items/changes", params={"since": since})
+    assert response.json() == {"changes": [], "next_since": since, "has_more": False}
+    
+    response = requests.post(f"{BASE_URL}/items/batch", json={"items": [{"title": f"Change Item {i}"} for i in range(3)]})
+    ids = [item["id"] for item in response.json()["success"]]
+    
+    # The batch is one write: a page of one item still returns all three
+    response = requests.get(f"{BASE_URL}/items/changes", params={"since": since, "limit": 1})
+    page = response.json()
+    assert [change["id"] for change in page["changes"]] == ids
+    assert len({change["change_seq"] for change in page["changes"]}) == 1
+    assert page["has_more"] is False
+    
+    requests.put(f"{BASE_URL}/items/{ids[0]}", json={"title": "Changed Item 0"})
+    requests.delete(f"{BASE_URL}/items/{ids[1]}")
+    response = requests.get(f"{BASE_URL}/items/changes", params={"since": page["next_since"]})
+    page = response.json()
+    assert [(change["id"], change["title"], change["deleted_at"] is not None) for change in page["changes"]] == [
+        (ids[0], "Changed Item 0", False),
+        (ids[1], "Change Item 1", True)
+    ]
+    assert page["changes"][0]["change_seq"] < page["changes"][1]["change_seq"]
+    assert page["has_more"] is False
+    
+    # Deleted items are gone from every other endpoint
+    assert requests.get(f"{BASE_URL}/items/{ids[1]}").status_code == 404
+    assert requests.put(f"{BASE_URL}/items/{ids[1]}", json={"title": "Back"}).status_code == 404
+    assert requests.delete(f"{BASE_URL}/items/{ids[1]}").status_code == 404
+    listed = requests.get(f"{BASE_URL}/items/", params={"title_prefix": "Change", "limit": 1000}).json()
+    assert ids[1] not in [item["id"] for item in listed]
+    response = requests.post(f"{BASE_URL}/items/batch/get", json={"item_ids": ids})
+    assert response.json()["missing"] == [ids[1]]
+    
+    response = requests.post(f"{BASE_URL}/items/batch/delete", json={"item_ids": [ids[0], ids[2]]})
+    assert len(response.json()["success"]) == 2
+    response = requests.get(f"{BASE_URL}/items/changes", params={"since": page["next_since"]})
+    assert [(change["id"], change["deleted_at"] is not None) for change in response.json()["changes"]] == [(ids[0], True), (ids[2], True)]
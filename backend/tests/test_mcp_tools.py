@@ -0,0 +1,30 @@
+import json
+
+from app.core.mcp_tools import limit_result
+
+# Tool result limits, checked without a running server
+
+def items(count):
+    return [{"id": i, "title": f"Item {i}", "description": "x" * 100} for i in range(count)]
+
+def test_small_result_is_compacted():
+    result = {"items": items(2), "missing": []}
+    assert limit_result(json.dumps(result, indent=2), 10000) == json.dumps(result, separators=(",", ":"))
+
+def test_large_list_is_cut_to_valid_json():
+    text, note = limit_result(json.dumps({"items": items(100), "missing": [7]}, indent=2), 2000).split("\n")
+    assert len(text) <= 2000
+    result = json.loads(text)
+    assert result["items"] == items(len(result["items"]))
+    assert result["missing"] == [7]
+    assert f"{len(result['items'])} of 100 items" in note
+
+def test_top_level_list_is_cut():
+    text, note = limit_result(json.dumps(items(100)), 1000).split("\n")
+    assert json.loads(text) == items(len(json.loads(text)))
+    assert "of 100 items" in note
+
+def test_plain_text_is_cut():
+    text = limit_result("Error " * 1000, 100)
+    assert text.startswith("Error " * 16)
+    assert "100 of 6000 characters" in text
@@ -0,0 +1,59 @@
+import itertools
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.core.changes import CHANGE_COLUMNS
+from app.core.pagination import SORT_KEYS, _after, sorted_items
+from app.models import models
+from app.schemas.item import ItemFilter
+
+# Runs EXPLAIN QUERY PLAN on the listing queries against an SQLite database
+# created from the models, so it needs no running server
+
+FILTERS = {
+    "is_active": {"is_active": True},
+    "created": {"created_after": datetime(2024, 1, 1), "created_before": datetime(2024, 2, 1)},
+    "updated": {"updated_after": datetime(2024, 1, 1), "updated_before": datetime(2024, 2, 1)},
+    "title_prefix": {"title_prefix": "Rep"},
+}
+
+# Every filter on its own and combined with is_active
+COMBINATIONS = [(name,) for name in FILTERS] + [("is_active", name) for name in FILTERS if name != "is_active"]
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+
+def query_plan(connection, stmt):
+    compiled = stmt.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return [row[-1] for row in rows]
+
+@pytest.mark.parametrize("sort", SORT_KEYS)
+@pytest.mark.parametrize("combination", COMBINATIONS, ids="+".join)
+@pytest.mark.parametrize("page", ["first", "next"])
+def test_filtered_listing_uses_index(connection, combination, sort, page):
+    filters = ItemFilter(**dict(itertools.chain.from_iterable(FILTERS[name].items() for name in combination)))
+    stmt = sorted_items(filters, sort).limit(101)
+    if page == "next":
+        key = "Report" if sort.lstrip("-") == "title" else datetime(2024, 1, 15)
+        stmt = stmt.where(_after(sort, 42, None if sort.lstrip("-") == "id" else key))
+
+    plan = query_plan(connection, stmt)
+    table_steps = [step for step in plan if step.startswith(("SCAN items", "SEARCH items"))]
+    assert table_steps, plan
+    for step in table_steps:
+        assert step != "SCAN items", f"full table scan: {plan}"
+
+def test_changes_use_sequence_index(connection):
+    seq = models.Item.change_seq
+    stmt = select(*CHANGE_COLUMNS).where(seq > 42).order_by(seq, models.Item.id).limit(101)
+    plan = query_plan(connection, stmt)
+    assert any("ix_items_change_seq" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), f"sorts the changes: {plan}"
@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, inspect, select
+
+from app.core.schema import add_missing_columns
+from app.models import models
+
+# Runs against an SQLite database with the items table as first released,
+# before version, deleted_at and change_seq were added, so it needs no
+# running server
+
+OLD_ITEMS_TABLE = (
+    "CREATE TABLE items ("
+    "id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(100) NOT NULL, description TEXT, "
+    "is_active BOOLEAN, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), updated_at DATETIME)"
+)
+
+def test_add_missing_columns():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(OLD_ITEMS_TABLE)
+        connection.exec_driver_sql("INSERT INTO items (title, is_active) VALUES ('Old item', 1)")
+
+        added = add_missing_columns(connection, models.Base.metadata)
+        assert added == ["items.version", "items.deleted_at", "items.change_seq"]
+        # Tables that do not exist yet are left to create_all
+        assert inspect(connection).get_table_names() == ["items"]
+
+        item = connection.execute(select(models.Item.__table__).where(models.Item.deleted_at.is_(None))).one()
+        assert (item.title, item.version, item.deleted_at, item.change_seq) == ("Old item", 1, None, 0)
+
+        # Nothing left to add
+        assert add_missing_columns(connection, models.Base.metadata) == []
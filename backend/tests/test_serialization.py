@@ -0,0 +1,38 @@
+import json
+from datetime import datetime
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core import serialization
+from app.schemas.item import ItemPage, ItemResponse
+
+# The fast path must produce what FastAPI produces from response_model:
+# the model dumped in JSON mode, encoded compactly without ASCII escaping
+
+ROWS = [
+    ("Plain", None, True, 1, datetime(2024, 1, 2, 3, 4, 5), None, 1),
+    ("Ünïcödé \"quoted\"", "line\nbreak", False, 2, datetime(2024, 1, 2, 3, 4, 5, 678), datetime(2024, 2, 3, 4, 5, 6), 7),
+]
+
+def reference(value, model):
+    data = TypeAdapter(model).dump_python(value, mode="json")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+@pytest.fixture(params=["orjson", "pydantic"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+def test_items_json_matches_response_model(encoder):
+    items = [ItemResponse(**dict(zip(serialization.ITEM_FIELDS, row))) for row in ROWS]
+    assert serialization.items_json(ROWS) == reference(items, List[ItemResponse])
+
+def test_item_page_json_matches_response_model(encoder):
+    items = [ItemResponse(**dict(zip(serialization.ITEM_FIELDS, row))) for row in ROWS]
+    page = ItemPage(items=items, next_cursor="abc")
+    assert serialization.item_page_json(ROWS, "abc") == reference(page, ItemPage)
+    assert json.loads(serialization.item_page_json([], None)) == {"items": [], "next_cursor": None}